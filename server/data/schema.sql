@@ -32,8 +32,33 @@ CREATE TABLE IF NOT EXISTS posts (
 CREATE INDEX IF NOT EXISTS idx_posts_tid ON posts(tid);
 CREATE INDEX IF NOT EXISTS idx_posts_author_uid ON posts(author_uid);
 CREATE INDEX IF NOT EXISTS idx_posts_timestamp ON posts(post_timestamp);
+-- Per-thread lookups: posts after a post_number (API), MAX(post_number) and
+-- MAX(post_timestamp) for a tid (monitor) read these instead of scanning
+CREATE INDEX IF NOT EXISTS idx_posts_tid_num ON posts(tid, post_number);
+CREATE INDEX IF NOT EXISTS idx_posts_tid_ts ON posts(tid, post_timestamp);
+-- Author-filtered variant (get_posts_after with author_uid)
+CREATE INDEX IF NOT EXISTS idx_posts_tid_author_num ON posts(tid, author_uid, post_number);
 CREATE INDEX IF NOT EXISTS idx_threads_author_uid ON threads(author_uid);
 
+-- Full-text index over post content for search_posts. External content
+-- (the text is stored in posts only); trigram tokens match any substring of
+-- 3+ characters, which also works for CJK text without word boundaries.
+-- The triggers keep it in sync; REPLACE relies on recursive_triggers so the
+-- replaced row's entry is removed
+CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+    content, content='posts', content_rowid='pid', tokenize='trigram'
+);
+CREATE TRIGGER IF NOT EXISTS posts_fts_ai AFTER INSERT ON posts BEGIN
+    INSERT INTO posts_fts(rowid, content) VALUES (new.pid, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS posts_fts_ad AFTER DELETE ON posts BEGIN
+    INSERT INTO posts_fts(posts_fts, rowid, content) VALUES ('delete', old.pid, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS posts_fts_au AFTER UPDATE ON posts BEGIN
+    INSERT INTO posts_fts(posts_fts, rowid, content) VALUES ('delete', old.pid, old.content);
+    INSERT INTO posts_fts(rowid, content) VALUES (new.pid, new.content);
+END;
+
 -- View: Latest posts by thread
 CREATE VIEW IF NOT EXISTS latest_posts AS
 SELECT 
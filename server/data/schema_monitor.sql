@@ -7,6 +7,7 @@ CREATE TABLE IF NOT EXISTS monitored_threads (
     author_notification TEXT,  -- Comma-separated UIDs to send notifications for, or NULL for none
     check_interval INTEGER DEFAULT 300,  -- Seconds between checks
     last_checked TIMESTAMP,
+    last_checked_ts INTEGER,  -- last_checked as UNIX time, compared by the due-thread query
     last_post_timestamp INTEGER DEFAULT 0,
     is_active BOOLEAN DEFAULT 1,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
@@ -26,5 +27,6 @@ CREATE TABLE IF NOT EXISTS monitoring_events (
 
 -- Create indexes
 CREATE INDEX IF NOT EXISTS idx_monitored_active ON monitored_threads(is_active);
+CREATE INDEX IF NOT EXISTS idx_monitored_due ON monitored_threads(is_active, last_checked_ts);
 CREATE INDEX IF NOT EXISTS idx_monitoring_events_tid ON monitoring_events(tid);
 CREATE INDEX IF NOT EXISTS idx_monitoring_events_created ON monitoring_events(created_at);
@@ -10,6 +10,50 @@ import argparse
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 
+def build_log_config() -> dict:
+    """
+    Build a uvicorn logging config that also routes the app's "nga" loggers.
+    
+    Application records use uvicorn's default formatter and stream so API,
+    monitor and access logs look alike, but are written through a queue so
+    the monitor's ingestion thread never blocks on console output.
+    """
+    import copy
+    from uvicorn.config import LOGGING_CONFIG
+
+    log_config = copy.deepcopy(LOGGING_CONFIG)
+    log_config['handlers']['nga'] = {'()': _queued_default_handler}
+    log_config['loggers']['nga'] = {'handlers': ['nga'], 'level': 'INFO', 'propagate': False}
+    return log_config
+
+
+def _queued_default_handler():
+    """dictConfig factory: uvicorn-style stderr handler behind a log queue."""
+    import logging
+    from uvicorn.logging import DefaultFormatter
+    from src.log_queue import queue_handler
+
+    target = logging.StreamHandler(sys.stderr)
+    target.setFormatter(DefaultFormatter("%(levelprefix)s %(message)s"))
+    return queue_handler(target)
+
+
+def pick_server_backends() -> dict:
+    """
+    Choose uvicorn's event loop and HTTP parser.
+    
+    uvloop and httptools (C implementations) are used when installed;
+    otherwise fall back to asyncio and h11 so the server still starts,
+    e.g. on Windows where uvloop is unavailable.
+    """
+    from importlib.util import find_spec
+
+    return {
+        'loop': 'uvloop' if find_spec('uvloop') else 'asyncio',
+        'http': 'httptools' if find_spec('httptools') else 'h11',
+    }
+
+
 def main():
     """Main entry point with command routing."""
     parser = argparse.ArgumentParser(
@@ -34,7 +78,7 @@ def main():
         # Run FastAPI server
         try:
             import uvicorn
-            import json
+            import orjson
         except ImportError:
             print("Error: uvicorn not installed. Run: pip install -r requirements.txt", file=sys.stderr)
             sys.exit(1)
@@ -46,8 +90,8 @@ def main():
 
         if os.path.exists(config_path):
             try:
-                with open(config_path, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
+                with open(config_path, 'rb') as f:
+                    config = orjson.loads(f.read())
                     default_host = config.get('server_host', default_host)
                     default_port = config.get('server_port', default_port)
             except Exception as e:
@@ -57,14 +101,19 @@ def main():
         host = args.host if args.host != '127.0.0.1' else default_host
         port = args.port if args.port != 8000 else default_port
 
+        backends = pick_server_backends()
+
         print(f"Starting NGA Reminder API Server on {host}:{port}")
         print(f"API Documentation: http://{host}:{port}/docs")
+        print(f"Event loop: {backends['loop']}, HTTP parser: {backends['http']}")
 
         uvicorn.run(
             "src.api:app",
             host=host,
             port=port,
-            reload=args.reload
+            reload=args.reload,
+            log_config=build_log_config(),
+            **backends
         )
     else:
         # Default to CLI mode (existing monitor functionality)
@@ -3,149 +3,380 @@
 FastAPI server for NGA Reminder.
 Provides REST API for querying posts with background monitoring.
 """
-from fastapi import FastAPI, Query, HTTPException
-from fastapi.responses import JSONResponse
-from typing import Optional, List, Dict, Any
+from fastapi import FastAPI, Query, HTTPException, Depends, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import Response, JSONResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict
+from typing import Optional, List, Dict, Any, Iterator, AsyncIterator, Callable, AsyncContextManager, Tuple
+import asyncio
+import hashlib
+import logging
+import sqlite3
 import threading
 import time
-from contextlib import asynccontextmanager
+import orjson
+from contextlib import asynccontextmanager, AsyncExitStack
 
 from .monitor import ThreadMonitor
-from .database import NGADatabase
+from .database import NGADatabase, NGADatabasePool, PoolTimeoutError
 
 
-# Global monitor instance and stop event
-monitor: Optional[ThreadMonitor] = None
-monitor_thread: Optional[threading.Thread] = None
-monitor_stop_event: Optional[threading.Event] = None
+logger = logging.getLogger("nga.api")
+
+DB_PATH = 'data/nga_data.db'
+DB_POOL_SIZE = 8
+DB_POOL_TIMEOUT = 5.0
+POSTS_DEFAULT_LIMIT = 500
+POSTS_MAX_LIMIT = 5000
+POSTS_CACHE_CONTROL = "max-age=5"
+SQLITE_INT_MAX = 2**31 - 1
+THREADS_CACHE_TTL = 2.0
+MONITOR_READY_TIMEOUT = 10.0
+# Shutdown waits MONITOR_STOP_TIMEOUT for the monitor to stop, then up to
+# MONITOR_STOP_GRACE more for a crawl or write in flight, then gives up on it
+MONITOR_STOP_TIMEOUT = 10.0
+MONITOR_STOP_GRACE = 50.0
+
+class ORJSONResponse(JSONResponse):
+    """JSON response rendered with orjson (fast, UTF-8 output for CJK post content)."""
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+class PostOut(BaseModel):
+    """A post as returned by /api/v1/posts."""
+    
+    model_config = ConfigDict(from_attributes=True)
+    
+    pid: int
+    tid: int
+    fid: int
+    author_name: str
+    author_uid: int
+    post_date: str
+    post_timestamp: int
+    post_number: int
+    content: Optional[str] = None
+    created_at: Optional[str] = None
+
+
+@asynccontextmanager
+async def database_lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Prepare the database file and own the read-only connection pool."""
+    # Open the database once so the schema exists and the file is switched
+    # to WAL before the monitor starts writing and the API reads
+    NGADatabase(DB_PATH).close()
+    
+    # The API never writes: handlers get mode=ro connections and the
+    # monitor keeps the only writer connection
+    app.state.db_pool = NGADatabasePool(DB_PATH, size=DB_POOL_SIZE, read_only=True,
+                                        timeout=DB_POOL_TIMEOUT)
+    
+    yield
+    
+    app.state.db_pool.close()
 
 
 @asynccontextmanager
-async def lifespan(app: FastAPI):
-    """Lifespan context manager for startup and shutdown events."""
-    global monitor, monitor_thread, monitor_stop_event
+async def monitor_lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Run the thread monitor as a task on the app's event loop.
+    
+    The blocking monitor loop runs in the loop's executor via asyncio.to_thread;
+    the task owns its lifetime, so shutdown awaits the loop instead of killing
+    a daemon thread mid-write. Monitor state lives on app.state: ``monitor``
+    (None until the task has built it) and ``monitor_task`` (read by /health).
+    """
+    state = app.state
+    state.monitor = None
     
-    # Startup: Initialize monitor and start background thread
-    print("Starting NGA Monitor background thread...")
+    # Startup: Initialize monitor and start background task
+    logger.info("Starting NGA Monitor background task...")
     
-    # Create stop event
-    monitor_stop_event = threading.Event()
+    # Create stop event and the event the monitor sets once it is ready
+    stop_event = threading.Event()
+    monitor_ready = threading.Event()
     
     def run_monitor():
         """Background task to run the monitor loop."""
-        global monitor
+        monitor = None
         try:
-            # Create ThreadMonitor instance inside the thread to avoid SQLite threading issues
-            monitor = ThreadMonitor()
+            # Create ThreadMonitor instance in the worker thread to avoid SQLite threading issues
+            monitor = ThreadMonitor(db_path=DB_PATH)
+            state.monitor = monitor
             
-            # Sync monitored threads from config file
-            print("Syncing monitored threads from config...")
-            sync_result = monitor.load_from_config(stop_event=monitor_stop_event)
-            if 'error' in sync_result:
-                print(f"Warning: {sync_result['error']}")
+            # Sync monitored threads from config file, unless nothing changed
+            # since the last complete sync (typical for plain restarts)
+            changed, fingerprint = monitor.config_changed_since_sync()
+            if not changed and monitor.list_monitored():
+                logger.info("Config unchanged since last sync, skipping sync")
             else:
-                print(f"Synced {sync_result.get('added', 0) + sync_result.get('updated', 0)} thread(s)")
+                logger.info("Syncing monitored threads from config...")
+                sync_result = monitor.load_from_config(stop_event=stop_event)
+                if 'error' in sync_result:
+                    logger.warning("Config sync: %s", sync_result['error'])
+                else:
+                    logger.info("Synced %d thread(s)", sync_result.get('added', 0) + sync_result.get('updated', 0))
+                    if not sync_result['errors'] and not stop_event.is_set():
+                        monitor.save_sync_state(fingerprint)
+            monitor_ready.set()
             
             # Run with a 30-second check interval (default from monitor.py)
-            monitor.run_loop(check_all_interval=30, stop_event=monitor_stop_event)
-        except Exception as e:
-            print(f"Monitor error: {e}")
-            import traceback
-            traceback.print_exc()
+            monitor.run_loop(check_all_interval=30, stop_event=stop_event)
+        except Exception:
+            logger.exception("Monitor crashed")
+        finally:
+            # Never leave startup waiting on a monitor that failed to come up
+            monitor_ready.set()
+            # Stop the check pool, flush buffered events and close the connections
+            if monitor is not None:
+                monitor.close()
     
-    monitor_thread = threading.Thread(target=run_monitor, daemon=True)
-    monitor_thread.start()
+    task = asyncio.create_task(asyncio.to_thread(run_monitor), name="nga-monitor")
+    state.monitor_task = task
     
-    # Wait a bit for monitor to initialize
-    time.sleep(0.5)
-    print("Monitor started.")
+    # Wait for the monitor to initialize without blocking the event loop
+    if not await asyncio.to_thread(monitor_ready.wait, MONITOR_READY_TIMEOUT):
+        logger.warning("Monitor still initializing after %.0fs, continuing startup", MONITOR_READY_TIMEOUT)
+    elif not task.done():
+        logger.info("Monitor started.")
     
     yield
     
-    # Shutdown: Signal monitor to stop
-    print("Shutting down monitor...")
-    if monitor_stop_event:
-        monitor_stop_event.set()
+    # Shutdown: Signal monitor to stop and wait for the loop to return.
+    # Cancelling would not interrupt the worker thread, so the stop event
+    # is the only way to end it
+    logger.info("Shutting down monitor...")
+    stop_event.set()
     
-    # Wait for monitor thread to finish (with timeout)
-    if monitor_thread and monitor_thread.is_alive():
-        monitor_thread.join(timeout=10.0)
-        if monitor_thread.is_alive():
-            print("Monitor thread did not stop gracefully (daemon will terminate)")
-        else:
-            print("Monitor stopped gracefully.")
+    done, _ = await asyncio.wait({task}, timeout=MONITOR_STOP_TIMEOUT)
+    if not done:
+        # A crawl in flight can outlast the timeout; returning early would
+        # close the database pool under the still-running monitor
+        logger.warning("Monitor did not stop within %.0fs, waiting up to %.0fs more...",
+                       MONITOR_STOP_TIMEOUT, MONITOR_STOP_GRACE)
+        done, _ = await asyncio.wait({task}, timeout=MONITOR_STOP_GRACE)
+    if done:
+        logger.info("Monitor stopped gracefully.")
+    else:
+        # Hung on a request or a locked database: exit anyway rather than
+        # block until the process is killed, which would skip all cleanup
+        logger.error("Monitor did not stop, shutting down without it")
+
+
+# Sub-lifespans entered in order on startup and exited in reverse on
+# shutdown. Mounted sub-apps (metrics exporters, MCP servers, ...) append
+# their own lifespan here instead of editing the ones above.
+LIFESPANS: List[Callable[[FastAPI], AsyncContextManager[None]]] = [
+    database_lifespan,
+    monitor_lifespan,
+]
+
+
+@asynccontextmanager
+async def merged_lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Lifespan context manager composing every entry in LIFESPANS."""
+    async with AsyncExitStack() as stack:
+        for lifespan in LIFESPANS:
+            await stack.enter_async_context(lifespan(app))
+        yield
 
 
 app = FastAPI(
     title="NGA Reminder API",
     description="REST API for querying NGA forum posts with background monitoring",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=merged_lifespan,
+    default_response_class=ORJSONResponse
 )
 
+# Post lists repeat the same keys and carry long CJK bodies, so they compress well
+app.add_middleware(GZipMiddleware, minimum_size=1024, compresslevel=5)
+
+
+def get_db(request: Request) -> Iterator[NGADatabase]:
+    """
+    Dependency that lends a pooled database handle to a single request.
+    
+    Yields:
+        NGADatabase instance, returned to the pool once the response is sent
+    """
+    with request.app.state.db_pool.connection() as db:
+        yield db
+
+
+@app.exception_handler(PoolTimeoutError)
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError) -> Response:
+    """Answer 503 when every pooled connection stays busy past DB_POOL_TIMEOUT."""
+    logger.warning("%s", exc)
+    return ORJSONResponse({"detail": "Database unavailable"}, status_code=503)
+
+
+# Static response bodies, serialized once at import
+_ROOT_BODY = orjson.dumps({
+    "message": "NGA Reminder API",
+    "version": "1.0.0",
+    "endpoints": {
+        "posts": "/api/v1/posts",
+        "docs": "/docs"
+    }
+})
+_HEALTH_RUNNING_BODY = orjson.dumps({"status": "healthy", "monitor_running": True})
+_HEALTH_STOPPED_BODY = orjson.dumps({"status": "healthy", "monitor_running": False})
+
 
 @app.get("/")
 async def root():
     """Root endpoint."""
-    return {
-        "message": "NGA Reminder API",
-        "version": "1.0.0",
-        "endpoints": {
-            "posts": "/api/v1/posts",
-            "docs": "/docs"
-        }
-    }
+    return Response(content=_ROOT_BODY, media_type="application/json")
+
+
+def _stream_posts_ndjson(db: NGADatabase, tid: int, start_post_number: int,
+                         author_uid: Optional[int], limit: int) -> Iterator[bytes]:
+    """Yield posts as NDJSON lines, reading rows from db as the stream is consumed."""
+    for post in db.iter_posts_after(tid, start_post_number, author_uid, limit):
+        yield orjson.dumps(post) + b"\n"
 
 
-@app.get("/api/v1/posts")
-async def get_posts(
-    tid: int = Query(..., description="Thread ID"),
-    start_post_number: int = Query(..., description="Start post number (exclusive)"),
-    author_uid: Optional[int] = Query(None, description="Filter by author UID")
-) -> List[Dict[str, Any]]:
+# PostOut only documents the response: rows are returned as-is, with no
+# per-row validation pass
+@app.get("/api/v1/posts", response_model=None, responses={200: {"model": List[PostOut]}})
+def get_posts(
+    tid: int = Query(..., ge=0, le=SQLITE_INT_MAX, description="Thread ID"),
+    start_post_number: int = Query(..., ge=-1, le=SQLITE_INT_MAX,
+                                   description="Start post number (exclusive, -1 includes the opening post)"),
+    author_uid: Optional[int] = Query(None, description="Filter by author UID"),
+    limit: int = Query(POSTS_DEFAULT_LIMIT, ge=1, le=POSTS_MAX_LIMIT, description="Maximum number of posts to return"),
+    format: str = Query("json", pattern="^(json|ndjson)$", description="Response format: json array or ndjson stream"),
+    db: NGADatabase = Depends(get_db)
+):
     """
     Get posts from a thread after a specific post number.
     
+    Declared as a plain ``def`` so FastAPI runs the blocking SQLite query
+    in its threadpool instead of on the event loop.
+    
+    With ``format=ndjson`` the posts are streamed as
+    ``application/x-ndjson``: one JSON object per line, in post_number
+    order, sent as rows are read so memory stays flat for long threads.
+    The default ``format=json`` returns a single JSON array.
+    
+    At most ``limit`` posts are returned; clients page forward by passing
+    the last post_number they received as the next start_post_number.
+    
     Args:
         tid: Thread ID
         start_post_number: Minimum post number (posts with post_number > this value)
         author_uid: Optional. Filter posts by author UID
+        limit: Maximum number of posts to return
+        format: "json" (default) or "ndjson"
+        db: Database handle injected by get_db
         
     Returns:
         List of posts matching the criteria
     """
+    if format == "ndjson":
+        # get_db only returns the connection after the response has been
+        # sent, so the stream can keep reading from the same handle
+        return StreamingResponse(
+            _stream_posts_ndjson(db, tid, start_post_number, author_uid, limit),
+            media_type="application/x-ndjson",
+            headers={"Cache-Control": POSTS_CACHE_CONTROL}
+        )
+    
     try:
-        db = NGADatabase('data/nga_data.db')
-        posts = db.get_posts_after(tid, start_post_number, author_uid)
-        db.close()
+        rows = db.get_posts_after(tid, start_post_number, author_uid, limit)
+    except sqlite3.OperationalError:
+        logger.exception("Database error reading posts for thread %d", tid)
+        raise HTTPException(status_code=503, detail="Database unavailable")
+    # Cache-Control lets a reverse proxy coalesce identical polls from many clients
+    return ORJSONResponse(rows, headers={"Cache-Control": POSTS_CACHE_CONTROL})
+
+
+# Serialized /api/v1/threads body shared by all callers for THREADS_CACHE_TTL seconds
+_threads_cache: Dict[str, Any] = {"deadline": 0.0, "payload": b"", "etag": ""}
+_threads_cache_lock = threading.Lock()
+
+
+def _get_threads_payload(pool: NGADatabasePool) -> Tuple[bytes, str]:
+    """
+    Return the serialized monitored-thread list and its ETag, refreshing at most once per TTL.
+    
+    Args:
+        pool: Connection pool, borrowed from only on a cache miss
+        
+    Returns:
+        Tuple of (JSON body, strong ETag)
+    """
+    with _threads_cache_lock:
+        if time.monotonic() < _threads_cache["deadline"]:
+            return _threads_cache["payload"], _threads_cache["etag"]
+    
+    with pool.connection() as db:
+        payload = orjson.dumps(db.get_monitored_threads())
+    etag = f'"{hashlib.blake2b(payload, digest_size=16).hexdigest()}"'
+    
+    with _threads_cache_lock:
+        _threads_cache.update(deadline=time.monotonic() + THREADS_CACHE_TTL, payload=payload, etag=etag)
+    return payload, etag
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag (weak comparison, as RFC 9110 asks).
+    
+    Args:
+        if_none_match: Header value: "*" or a comma-separated list of ETags
+        etag: Current strong ETag, quotes included
         
-        return posts
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Database error: {str(e)}")
+    Returns:
+        True if the client's copy is current
+    """
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*" or tag.removeprefix("W/") == etag:
+            return True
+    return False
 
 
-@app.get("/api/v1/threads")
-async def list_monitored_threads() -> List[Dict[str, Any]]:
+@app.get("/api/v1/threads", response_model=List[Dict[str, Any]])
+async def list_monitored_threads(request: Request) -> Response:
     """
     Get list of currently monitored threads.
     
+    Reads through a pooled API connection in a worker thread rather than
+    the monitor's own connection, which belongs to the monitor thread.
+    The serialized list is reused for a couple of seconds and tagged with
+    an ETag; clients sending a matching If-None-Match get 304 Not Modified.
+    A connection is only borrowed when the cached list has expired.
+    
+    Args:
+        request: Incoming request (checked for If-None-Match)
+    
     Returns:
         List of monitored threads with their configuration
     """
-    if not monitor:
+    if not request.app.state.monitor:
         raise HTTPException(status_code=503, detail="Monitor not initialized")
     
     try:
-        threads = monitor.list_monitored()
-        return threads
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error: {str(e)}")
+        payload, etag = await asyncio.to_thread(_get_threads_payload, request.app.state.db_pool)
+    except sqlite3.OperationalError:
+        logger.exception("Database error listing monitored threads")
+        raise HTTPException(status_code=503, detail="Database unavailable")
+    
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=payload, media_type="application/json", headers={"ETag": etag})
 
 
 @app.get("/health")
-async def health_check():
+async def health_check(request: Request):
     """Health check endpoint."""
-    return {
-        "status": "healthy",
-        "monitor_running": monitor is not None and monitor_thread is not None and monitor_thread.is_alive()
-    }
+    state = request.app.state
+    running = state.monitor is not None and not state.monitor_task.done()
+    body = _HEALTH_RUNNING_BODY if running else _HEALTH_STOPPED_BODY
+    return Response(content=body, media_type="application/json")
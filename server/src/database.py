@@ -5,46 +5,221 @@ Handles SQLite database operations for storing threads and posts.
 """
 
 import sqlite3
-from typing import Dict, Any, List, Optional
+import queue
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Dict, Any, List, Optional, Iterator, Iterable, Set, Tuple
 from datetime import datetime
 import os
+from pathlib import Path
+
+
+# Hot-path queries kept as module constants so every call passes the same
+# SQL text and hits sqlite3's per-connection statement cache. LIMIT -1
+# means "no limit" in SQLite.
+_POSTS_AFTER_SQL = '''
+    SELECT * FROM posts
+    WHERE tid = ? AND post_number > ?
+    ORDER BY post_number
+    LIMIT ?
+'''
+_POSTS_AFTER_BY_AUTHOR_SQL = '''
+    SELECT * FROM posts
+    WHERE tid = ? AND post_number > ? AND author_uid = ?
+    ORDER BY post_number
+    LIMIT ?
+'''
+_HAS_POSTS_AFTER_SQL = 'SELECT EXISTS(SELECT 1 FROM posts WHERE tid = ? AND post_number > ?)'
+_POSTS_BY_THREAD_SQL = 'SELECT * FROM posts WHERE tid = ? ORDER BY post_timestamp LIMIT ?'
+_POSTS_BY_AUTHOR_SQL = 'SELECT * FROM posts WHERE author_uid = ? ORDER BY post_timestamp DESC LIMIT ?'
+_SEARCH_POSTS_SQL = '''
+    SELECT * FROM posts 
+    WHERE content LIKE ? 
+    ORDER BY post_timestamp DESC 
+    LIMIT ?
+'''
+_SEARCH_POSTS_FTS_SQL = '''
+    SELECT p.* FROM posts_fts f
+    JOIN posts p ON p.pid = f.rowid
+    WHERE posts_fts MATCH ?
+    ORDER BY p.post_timestamp DESC
+    LIMIT ?
+'''
+# An unchanged thread row is left as is (no page write, updated_at kept)
+_UPSERT_THREAD_SQL = '''
+    INSERT INTO threads (
+        tid, title, author_name, author_uid,
+        total_posts, total_pages, updated_at
+    ) VALUES (?, ?, ?, ?, ?, ?, datetime('now', 'localtime'))
+    ON CONFLICT(tid) DO UPDATE SET
+        title = excluded.title,
+        total_posts = excluded.total_posts,
+        total_pages = excluded.total_pages,
+        updated_at = datetime('now', 'localtime')
+    WHERE title IS NOT excluded.title
+        OR total_posts IS NOT excluded.total_posts
+        OR total_pages IS NOT excluded.total_pages
+'''
+_POST_COLUMNS_SQL = '''posts (
+        pid, tid, fid, author_name, author_uid, post_date,
+        post_timestamp, content, post_number
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+_INSERT_POST_SQL = 'INSERT OR REPLACE INTO ' + _POST_COLUMNS_SQL
+_INSERT_NEW_POST_SQL = 'INSERT OR IGNORE INTO ' + _POST_COLUMNS_SQL
+
+
+# Stay below SQLITE_MAX_VARIABLE_NUMBER (999 on older SQLite builds)
+_MAX_SQL_PARAMS = 900
+
+# Values accepted for PRAGMA synchronous (config key "pragma_synchronous")
+SYNCHRONOUS_MODES = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+
+# Prepared statements kept per connection (sqlite3's default is 128). IN (...)
+# lookups of different lengths are each a separate statement and would
+# otherwise push the fixed hot queries out of the cache
+STATEMENT_CACHE_SIZE = 256
+
+# Stored in PRAGMA user_version once the schema script has run, so later
+# opens skip it. Bump whenever schema.sql / _create_tables_inline change
+SCHEMA_VERSION = 2
+
+# Shortest keyword the posts_fts trigram index can match; shorter ones use LIKE
+MIN_FTS_KEYWORD_LENGTH = 3
 
 
 class NGADatabase:
     """SQLite database manager for NGA BBS data."""
     
-    def __init__(self, db_path: str = "nga_data.db"):
+    # Contents of data/schema.sql, read on first use and shared by all instances
+    _schema_sql: Optional[str] = None
+    
+    def __init__(self, db_path: str = "nga_data.db", check_same_thread: bool = True,
+                 read_only: bool = False, synchronous: str = "NORMAL"):
         """
         Initialize database connection.
         
         Args:
             db_path: Path to SQLite database file
+            check_same_thread: Restrict the connection to the creating thread.
+                Pass False when the connection is handed between worker threads.
+            read_only: Open the existing file with mode=ro and skip schema setup.
+                The database must already exist (and be in WAL mode).
+            synchronous: PRAGMA synchronous for writes, one of SYNCHRONOUS_MODES.
+                OFF is fastest but can lose recent commits on power loss.
         """
+        synchronous = synchronous.upper()
+        if synchronous not in SYNCHRONOUS_MODES:
+            raise ValueError(f"synchronous must be one of {', '.join(SYNCHRONOUS_MODES)}, got {synchronous!r}")
         self.db_path = db_path
+        self.check_same_thread = check_same_thread
+        self.read_only = read_only
+        self.synchronous = synchronous
         self.conn = None
         self.cursor = None
+        self._tx_depth = 0
         self._connect()
-        self._init_schema()
+        if not read_only:
+            self._init_schema()
     
     def _connect(self):
         """Establish database connection."""
-        self.conn = sqlite3.connect(self.db_path)
+        if self.read_only:
+            uri = f"{Path(self.db_path).absolute().as_uri()}?mode=ro"
+            self.conn = sqlite3.connect(uri, uri=True, check_same_thread=self.check_same_thread,
+                                        cached_statements=STATEMENT_CACHE_SIZE)
+        else:
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=self.check_same_thread,
+                                        cached_statements=STATEMENT_CACHE_SIZE)
         self.conn.row_factory = sqlite3.Row  # Enable column access by name
         self.cursor = self.conn.cursor()
+        self._apply_pragmas()
+    
+    def _apply_pragmas(self):
+        """
+        Tune the connection for one writer (the monitor) and concurrent readers (the API).
+        
+        WAL lets readers proceed while the monitor writes, synchronous=NORMAL
+        (the default) defers fsync to checkpoints, and busy_timeout makes lock
+        waits block instead of failing immediately with SQLITE_BUSY. Read-only
+        connections only get the per-connection settings; the journal mode
+        belongs to the file and is set by a writer.
+        """
+        if not self.read_only:
+            # journal_mode reports the mode actually in effect, which stays
+            # "delete" when WAL is unavailable (e.g. on some network filesystems)
+            # and is "memory" for in-memory databases, which have no journal file
+            try:
+                journal_mode = self.cursor.execute('PRAGMA journal_mode = WAL').fetchone()[0]
+            except sqlite3.DatabaseError as e:
+                # e.g. a database file without write permission
+                journal_mode = f'unchanged ({e})'
+            if journal_mode.lower() not in ('wal', 'memory'):
+                print(f"Warning: SQLite WAL mode unavailable for {self.db_path}, using {journal_mode}")
+            self.cursor.execute(f'PRAGMA synchronous = {self.synchronous}')
+            # INSERT OR REPLACE must fire posts' delete trigger for posts_fts
+            self.cursor.execute('PRAGMA recursive_triggers = ON')
+            # Bound the ANALYZE run by optimize() to a sample per index
+            self.cursor.execute('PRAGMA analysis_limit = 1000')
+        self.cursor.executescript('''
+            PRAGMA busy_timeout = 30000;
+            PRAGMA cache_size = -64000;
+            PRAGMA temp_store = MEMORY;
+            PRAGMA mmap_size = 268435456;
+        ''')
+    
+    @classmethod
+    def _load_schema_sql(cls) -> Optional[str]:
+        """Read schema.sql once per process (None if the file is missing)."""
+        if cls._schema_sql is None:
+            # ../data/schema.sql relative to database.py
+            schema_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'schema.sql')
+            if os.path.exists(schema_path):
+                with open(schema_path, 'r', encoding='utf-8') as f:
+                    cls._schema_sql = f.read()
+        return cls._schema_sql
     
     def _init_schema(self):
-        """Initialize database schema from schema.sql file."""
-        # ../data/schema.sql relative to database.py
-        schema_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'schema.sql')
-        
-        if os.path.exists(schema_path):
-            with open(schema_path, 'r', encoding='utf-8') as f:
-                schema_sql = f.read()
-                self.cursor.executescript(schema_sql)
-                self.conn.commit()
+        """Initialize database schema from schema.sql file (skipped if already at SCHEMA_VERSION)."""
+        if self.cursor.execute('PRAGMA user_version').fetchone()[0] >= SCHEMA_VERSION:
+            return
+        self._check_fts5_trigram()
+        
+        # Indexes added to an existing database need fresh statistics
+        # before the planner will prefer them
+        had_tid_indexes = self.cursor.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE type = 'index' AND name IN ('idx_posts_tid_num', 'idx_posts_tid_ts')"
+        ).fetchone()[0] == 2
+        had_fts = self.cursor.execute(
+            "SELECT COUNT(*) FROM sqlite_master WHERE name = 'posts_fts'"
+        ).fetchone()[0] == 1
+        
+        schema_sql = self._load_schema_sql()
+        if schema_sql is not None:
+            self.cursor.executescript(schema_sql)
+            self.conn.commit()
         else:
             # Fallback: create tables inline if schema.sql doesn't exist
             self._create_tables_inline()
+        
+        if not had_tid_indexes:
+            self.cursor.execute('ANALYZE posts')
+        if not had_fts:
+            # Index posts stored before the full-text table existed
+            self.cursor.execute("INSERT INTO posts_fts(posts_fts) VALUES ('rebuild')")
+        self.cursor.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+        self.conn.commit()
+    
+    def _check_fts5_trigram(self):
+        """Fail early if this SQLite build cannot create the posts_fts trigram index."""
+        try:
+            self.cursor.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(x, tokenize='trigram')")
+            self.cursor.execute('DROP TABLE temp.fts5_probe')
+        except sqlite3.OperationalError as e:
+            raise RuntimeError(
+                f"SQLite {sqlite3.sqlite_version} lacks FTS5 with the trigram tokenizer "
+                f"(needs SQLite 3.34+ built with FTS5) for post search: {e}"
+            ) from e
     
     def _create_tables_inline(self):
         """Create tables inline if schema.sql is not found."""
@@ -77,10 +252,94 @@ class NGADatabase:
             CREATE INDEX IF NOT EXISTS idx_posts_tid ON posts(tid);
             CREATE INDEX IF NOT EXISTS idx_posts_author_uid ON posts(author_uid);
             CREATE INDEX IF NOT EXISTS idx_posts_timestamp ON posts(post_timestamp);
+            CREATE INDEX IF NOT EXISTS idx_posts_tid_num ON posts(tid, post_number);
+            CREATE INDEX IF NOT EXISTS idx_posts_tid_ts ON posts(tid, post_timestamp);
+            CREATE INDEX IF NOT EXISTS idx_posts_tid_author_num ON posts(tid, author_uid, post_number);
             CREATE INDEX IF NOT EXISTS idx_threads_author_uid ON threads(author_uid);
+            
+            CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+                content, content='posts', content_rowid='pid', tokenize='trigram'
+            );
+            CREATE TRIGGER IF NOT EXISTS posts_fts_ai AFTER INSERT ON posts BEGIN
+                INSERT INTO posts_fts(rowid, content) VALUES (new.pid, new.content);
+            END;
+            CREATE TRIGGER IF NOT EXISTS posts_fts_ad AFTER DELETE ON posts BEGIN
+                INSERT INTO posts_fts(posts_fts, rowid, content) VALUES ('delete', old.pid, old.content);
+            END;
+            CREATE TRIGGER IF NOT EXISTS posts_fts_au AFTER UPDATE ON posts BEGIN
+                INSERT INTO posts_fts(posts_fts, rowid, content) VALUES ('delete', old.pid, old.content);
+                INSERT INTO posts_fts(rowid, content) VALUES (new.pid, new.content);
+            END;
         ''')
         self.conn.commit()
     
+    @contextmanager
+    def transaction(self) -> Iterator['NGADatabase']:
+        """
+        Group several writes into one transaction with a single commit.
+        
+        save_* calls inside the block skip their own commit and are wrapped in
+        savepoints, so a failed batch is undone without losing the rest. An
+        exception escaping the block rolls everything back. A nested block
+        becomes a savepoint of the outer one: its failure only undoes its own
+        writes, and its work is committed with the outermost block. Writes
+        left uncommitted on the connection before the outermost block are
+        committed when it starts.
+        
+        Yields:
+            This NGADatabase instance
+        """
+        if self._tx_depth:
+            self._tx_depth += 1
+            try:
+                with self._savepoint('nga_tx'):
+                    yield self
+            finally:
+                self._tx_depth -= 1
+            return
+        
+        if self.conn.in_transaction:
+            self.conn.commit()
+        # IMMEDIATE takes the write lock up front, so the transaction cannot
+        # fail later with SQLITE_BUSY when its first read upgrades to a write
+        self.conn.execute('BEGIN IMMEDIATE')
+        self._tx_depth = 1
+        try:
+            yield self
+        except BaseException:
+            self._tx_depth = 0
+            self.conn.rollback()
+            raise
+        self._tx_depth = 0
+        self.conn.commit()
+    
+    @contextmanager
+    def _savepoint(self, name: str) -> Iterator[None]:
+        """Run a block inside a savepoint, undoing only the block on error."""
+        self.conn.execute(f'SAVEPOINT {name}')
+        try:
+            yield
+        except BaseException:
+            self.conn.execute(f'ROLLBACK TO {name}')
+            self.conn.execute(f'RELEASE {name}')
+            raise
+        self.conn.execute(f'RELEASE {name}')
+    
+    @contextmanager
+    def _atomic(self) -> Iterator[None]:
+        """Commit or roll back one save, or use a savepoint inside transaction()."""
+        if self._tx_depth:
+            with self._savepoint('nga_save'):
+                yield
+            return
+        
+        try:
+            yield
+        except Exception:
+            self.conn.rollback()
+            raise
+        self.conn.commit()
+    
     def save_thread(self, thread_data: Dict[str, Any]) -> bool:
         """
         Save or update thread information.
@@ -92,84 +351,68 @@ class NGADatabase:
             True if successful, False otherwise
         """
         try:
-            self.cursor.execute('''
-                INSERT INTO threads (
-                    tid, title, author_name, author_uid,
-                    total_posts, total_pages, updated_at
-                ) VALUES (?, ?, ?, ?, ?, ?, datetime('now', 'localtime'))
-                ON CONFLICT(tid) DO UPDATE SET
-                    title = excluded.title,
-                    total_posts = excluded.total_posts,
-                    total_pages = excluded.total_pages,
-                    updated_at = datetime('now', 'localtime')
-            ''', (
-                thread_data['tid'],
-                thread_data['title'],
-                thread_data['author_name'],
-                thread_data['author_uid'],
-                thread_data.get('total_posts', 0),
-                thread_data.get('total_pages', 0)
-            ))
-            self.conn.commit()
+            with self._atomic():
+                self.cursor.execute(_UPSERT_THREAD_SQL, (
+                    thread_data['tid'],
+                    thread_data['title'],
+                    thread_data['author_name'],
+                    thread_data['author_uid'],
+                    thread_data.get('total_posts', 0),
+                    thread_data.get('total_pages', 0)
+                ))
             return True
         except Exception as e:
             print(f"Error saving thread: {e}")
-            self.conn.rollback()
             return False
     
-    def save_post(self, post_data: Dict[str, Any]) -> bool:
+    def save_post(self, post_data: Dict[str, Any], commit: bool = True) -> bool:
         """
         Save a single post.
         
         Args:
             post_data: Dictionary containing post data
+            commit: Commit right away. Pass False when saving many posts one
+                by one and call conn.commit() once afterwards (or prefer
+                save_posts_batch / transaction())
             
         Returns:
             True if successful, False otherwise
         """
         try:
-            self.cursor.execute('''
-                INSERT OR REPLACE INTO posts (
-                    pid, tid, fid, author_name, author_uid, post_date,
-                    post_timestamp, content, post_number
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                post_data['pid'],
-                post_data['tid'],
-                post_data['fid'],
-                post_data['author_name'],
-                post_data['author_uid'],
-                post_data['post_date'],
-                post_data['post_timestamp'],
-                post_data.get('content', ''),
-                post_data.get('post_number', 0)
-            ))
-            self.conn.commit()
+            with self._atomic() if commit else nullcontext():
+                self.cursor.execute(_INSERT_POST_SQL, (
+                    post_data['pid'],
+                    post_data['tid'],
+                    post_data['fid'],
+                    post_data['author_name'],
+                    post_data['author_uid'],
+                    post_data['post_date'],
+                    post_data['post_timestamp'],
+                    post_data.get('content', ''),
+                    post_data.get('post_number', 0)
+                ))
             return True
         except Exception as e:
             print(f"Error saving post {post_data.get('pid')}: {e}")
-            self.conn.rollback()
             return False
     
-    def save_posts_batch(self, posts: List[Dict[str, Any]]) -> int:
+    def save_posts_batch(self, posts: List[Dict[str, Any]], ignore_existing: bool = False) -> int:
         """
         Save multiple posts in a batch.
         
         Args:
             posts: List of post dictionaries
+            ignore_existing: Keep already stored posts (same pid) untouched
+                instead of replacing them
             
         Returns:
-            Number of posts successfully saved
+            Number of posts successfully saved (with ignore_existing, only
+            the ones actually inserted)
         """
         saved_count = 0
         try:
-            for post_data in posts:
-                self.cursor.execute('''
-                    INSERT OR REPLACE INTO posts (
-                        pid, tid, fid, author_name, author_uid, post_date,
-                        post_timestamp, content, post_number
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
+            rows = [
+                (
                     post_data['pid'],
                     post_data['tid'],
                     post_data['fid'],
@@ -179,12 +422,18 @@ class NGADatabase:
                     post_data['post_timestamp'],
                     post_data.get('content', ''),
                     post_data.get('post_number', 0)
-                ))
-                saved_count += 1
-            self.conn.commit()
+                )
+                for post_data in posts
+            ]
+            
+            # One prepared statement stepped for every row
+            sql = _INSERT_NEW_POST_SQL if ignore_existing else _INSERT_POST_SQL
+            with self._atomic():
+                self.cursor.executemany(sql, rows)
+            # rowcount sums the rows changed by all executions; ignored rows add 0
+            saved_count = self.cursor.rowcount if ignore_existing else len(rows)
         except Exception as e:
             print(f"Error in batch save: {e}")
-            self.conn.rollback()
         
         return saved_count
     
@@ -202,6 +451,25 @@ class NGADatabase:
         row = self.cursor.fetchone()
         return dict(row) if row else None
     
+    def get_existing_pids(self, pids: Iterable[int]) -> Set[int]:
+        """
+        Return which of the given post IDs are already stored.
+        
+        Args:
+            pids: Post IDs to look up
+            
+        Returns:
+            Set of the pids that exist in the posts table
+        """
+        pids = list(pids)
+        existing = set()
+        for i in range(0, len(pids), _MAX_SQL_PARAMS):
+            chunk = pids[i:i + _MAX_SQL_PARAMS]
+            placeholders = ','.join('?' * len(chunk))
+            rows = self.conn.execute(f'SELECT pid FROM posts WHERE pid IN ({placeholders})', chunk)
+            existing.update(row[0] for row in rows)
+        return existing
+    
     def get_posts_by_thread(self, tid: int, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Get all posts for a thread.
@@ -213,12 +481,21 @@ class NGADatabase:
         Returns:
             List of post dictionaries
         """
-        query = 'SELECT * FROM posts WHERE tid = ? ORDER BY post_timestamp'
-        if limit:
-            query += f' LIMIT {limit}'
+        return list(self.iter_posts_by_thread(tid, limit))
+    
+    def iter_posts_by_thread(self, tid: int, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream a thread's posts, one row at a time (see get_posts_by_thread).
         
-        self.cursor.execute(query, (tid,))
-        return [dict(row) for row in self.cursor.fetchall()]
+        Args:
+            tid: Thread ID
+            limit: Optional limit on number of posts
+            
+        Yields:
+            Post dictionaries ordered by post_timestamp
+        """
+        for row in self.conn.execute(_POSTS_BY_THREAD_SQL, (tid, limit or -1)):
+            yield dict(row)
     
     def get_posts_by_author(self, author_uid: int, limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
@@ -231,14 +508,24 @@ class NGADatabase:
         Returns:
             List of post dictionaries
         """
-        query = 'SELECT * FROM posts WHERE author_uid = ? ORDER BY post_timestamp DESC'
-        if limit:
-            query += f' LIMIT {limit}'
+        return list(self.iter_posts_by_author(author_uid, limit))
+    
+    def iter_posts_by_author(self, author_uid: int, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream an author's posts, one row at a time (see get_posts_by_author).
         
-        self.cursor.execute(query, (author_uid,))
-        return [dict(row) for row in self.cursor.fetchall()]
+        Args:
+            author_uid: Author's UID
+            limit: Optional limit on number of posts
+            
+        Yields:
+            Post dictionaries, newest first
+        """
+        for row in self.conn.execute(_POSTS_BY_AUTHOR_SQL, (author_uid, limit or -1)):
+            yield dict(row)
     
-    def get_posts_after(self, tid: int, start_post_number: int, author_uid: Optional[int] = None) -> List[Dict[str, Any]]:
+    def get_posts_after(self, tid: int, start_post_number: int, author_uid: Optional[int] = None,
+                        limit: Optional[int] = None) -> List[Dict[str, Any]]:
         """
         Get posts after a specific post number with optional author filter.
         
@@ -246,26 +533,149 @@ class NGADatabase:
             tid: Thread ID
             start_post_number: Minimum post number (exclusive)
             author_uid: Optional author UID filter
+            limit: Optional maximum number of posts to return
             
         Returns:
             List of post dictionaries
         """
+        return list(self.iter_posts_after(tid, start_post_number, author_uid, limit))
+    
+    def has_posts_after(self, tid: int, start_post_number: int) -> bool:
+        """
+        Check whether a thread has any post after a post number.
+        
+        Stops at the first matching entry of the (tid, post_number) index
+        instead of reading any posts.
+        
+        Args:
+            tid: Thread ID
+            start_post_number: Minimum post number (exclusive)
+            
+        Returns:
+            True if at least one such post is stored
+        """
+        return bool(self.conn.execute(_HAS_POSTS_AFTER_SQL, (tid, start_post_number)).fetchone()[0])
+    
+    def iter_posts_after(self, tid: int, start_post_number: int, author_uid: Optional[int] = None,
+                         limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream posts after a specific post number, one row at a time.
+        
+        Same filters as get_posts_after, but rows are yielded as SQLite
+        returns them instead of being collected into a list first.
+        
+        Args:
+            tid: Thread ID
+            start_post_number: Minimum post number (exclusive)
+            author_uid: Optional author UID filter
+            limit: Optional maximum number of posts to yield
+            
+        Yields:
+            Post dictionaries ordered by post_number
+        """
+        limit = -1 if limit is None else limit
         if author_uid:
-            query = '''
-                SELECT * FROM posts 
-                WHERE tid = ? AND post_number > ? AND author_uid = ?
-                ORDER BY post_number
-            '''
-            self.cursor.execute(query, (tid, start_post_number, author_uid))
+            query = _POSTS_AFTER_BY_AUTHOR_SQL
+            params = (tid, start_post_number, author_uid, limit)
         else:
-            query = '''
-                SELECT * FROM posts 
-                WHERE tid = ? AND post_number > ?
-                ORDER BY post_number
-            '''
-            self.cursor.execute(query, (tid, start_post_number))
+            query = _POSTS_AFTER_SQL
+            params = (tid, start_post_number, limit)
         
-        return [dict(row) for row in self.cursor.fetchall()]
+        # Own cursor, so a partially consumed stream is not clobbered by
+        # other calls on self.cursor
+        for row in self.conn.execute(query, params):
+            yield dict(row)
+    
+    def get_monitored_threads(self) -> List[Dict[str, Any]]:
+        """
+        Get active monitored threads joined with their thread metadata.
+        
+        Returns:
+            List of monitored thread dictionaries, most recently checked first
+        """
+        return [dict(row) for row in self.get_monitored_thread_rows()]
+    
+    def get_monitored_thread_rows(self) -> List[sqlite3.Row]:
+        """
+        Same as get_monitored_threads, but returns the sqlite3.Row objects
+        as fetched, for callers that only read columns by name.
+        """
+        return self.conn.execute('''
+            SELECT 
+                m.*,
+                t.title,
+                t.author_name,
+                t.total_posts
+            FROM monitored_threads m
+            JOIN threads t ON m.tid = t.tid
+            WHERE m.is_active = 1
+            ORDER BY m.last_checked DESC
+        ''').fetchall()
+    
+    def iter_monitoring_status(self) -> Iterator[sqlite3.Row]:
+        """
+        Iterate over active monitored threads for status display.
+        
+        Only reads the columns the status table shows (tid, title,
+        check_interval, last_checked), streaming rows from the cursor
+        instead of building a list.
+        
+        Returns:
+            Cursor over the rows, ordered as in get_monitored_thread_rows
+        """
+        return self.conn.execute('''
+            SELECT m.tid, t.title, m.check_interval, m.last_checked
+            FROM monitored_threads m
+            JOIN threads t ON m.tid = t.tid
+            WHERE m.is_active = 1
+            ORDER BY m.last_checked DESC
+        ''')
+    
+    def get_due_monitored_threads(self, now: float) -> List[sqlite3.Row]:
+        """
+        Get active monitored threads whose check_interval has passed.
+        
+        Args:
+            now: Current UNIX time
+            
+        Returns:
+            Rows as in get_monitored_thread_rows plus overdue_by (seconds past
+            due; never-checked threads count from the epoch), most overdue first
+        """
+        return self.conn.execute('''
+            SELECT 
+                m.*,
+                t.title,
+                t.author_name,
+                t.total_posts,
+                ? - COALESCE(m.last_checked_ts, 0) - m.check_interval AS overdue_by
+            FROM monitored_threads m
+            JOIN threads t ON m.tid = t.tid
+            WHERE m.is_active = 1 AND overdue_by >= 0
+            ORDER BY overdue_by DESC
+        ''', (now,)).fetchall()
+    
+    def get_monitoring_schedule(self, now: float) -> Tuple[int, Optional[float]]:
+        """
+        Summarize active monitored threads for scheduling.
+        
+        Args:
+            now: Current UNIX time
+            
+        Returns:
+            Tuple of (number of active monitored threads, UNIX time the next
+            not-yet-due thread becomes due, or None if none is pending)
+        """
+        count, next_due_at = self.conn.execute('''
+            SELECT 
+                COUNT(*),
+                MIN(CASE WHEN COALESCE(m.last_checked_ts, 0) + m.check_interval > ?
+                         THEN COALESCE(m.last_checked_ts, 0) + m.check_interval END)
+            FROM monitored_threads m
+            JOIN threads t ON m.tid = t.tid
+            WHERE m.is_active = 1
+        ''', (now,)).fetchone()
+        return count, next_due_at
     
     def get_thread_stats(self) -> List[Dict[str, Any]]:
         """
@@ -288,17 +698,47 @@ class NGADatabase:
         Returns:
             List of matching posts
         """
-        self.cursor.execute('''
-            SELECT * FROM posts 
-            WHERE content LIKE ? 
-            ORDER BY post_timestamp DESC 
-            LIMIT ?
-        ''', (f'%{keyword}%', limit))
-        return [dict(row) for row in self.cursor.fetchall()]
+        return list(self.iter_search_posts(keyword, limit))
+    
+    def iter_search_posts(self, keyword: str, limit: int = 100) -> Iterator[Dict[str, Any]]:
+        """
+        Stream posts matching a keyword, one row at a time (see search_posts).
+        
+        Args:
+            keyword: Search keyword
+            limit: Maximum number of results
+            
+        Yields:
+            Matching post dictionaries, newest first
+        """
+        if len(keyword) >= MIN_FTS_KEYWORD_LENGTH:
+            # Quoted as one FTS5 phrase: a case-insensitive substring match like LIKE
+            phrase = '"' + keyword.replace('"', '""') + '"'
+            rows = self.conn.execute(_SEARCH_POSTS_FTS_SQL, (phrase, limit))
+        else:
+            rows = self.conn.execute(_SEARCH_POSTS_SQL, (f'%{keyword}%', limit))
+        for row in rows:
+            yield dict(row)
+    
+    def optimize(self):
+        """
+        Refresh query planner statistics where SQLite considers them stale.
+        
+        Runs PRAGMA optimize, which only analyzes tables whose size changed
+        noticeably since the last ANALYZE (sampled, see analysis_limit).
+        No-op on read-only connections, which cannot store statistics.
+        """
+        if self.read_only:
+            return
+        try:
+            self.conn.execute('PRAGMA optimize')
+        except sqlite3.Error as e:
+            print(f"Warning: PRAGMA optimize failed: {e}")
     
     def close(self):
-        """Close database connection."""
+        """Close database connection (refreshing planner statistics first)."""
         if self.conn:
+            self.optimize()
             self.conn.close()
     
     def __enter__(self):
@@ -310,6 +750,100 @@ class NGADatabase:
         self.close()
 
 
+class PoolTimeoutError(TimeoutError):
+    """Raised when no pooled connection is handed back within the pool's timeout."""
+
+
+class NGADatabasePool:
+    """
+    Bounded pool of reusable NGADatabase connections.
+    
+    Connections are opened lazily up to ``size`` and handed out one at a time,
+    so callers skip the file open and schema setup on every use.
+    """
+    
+    def __init__(self, db_path: str, size: int = 5, read_only: bool = False,
+                 timeout: Optional[float] = None):
+        """
+        Initialize the pool.
+        
+        Args:
+            db_path: Path to SQLite database file
+            size: Maximum number of open connections
+            read_only: Open every connection read-only (see NGADatabase)
+            timeout: Seconds to wait for a free connection once all are
+                borrowed (None waits indefinitely)
+        """
+        self.db_path = db_path
+        self.size = size
+        self.read_only = read_only
+        self.timeout = timeout
+        self._idle: queue.LifoQueue = queue.LifoQueue(maxsize=size)
+        self._opened = 0
+        self._lock = threading.Lock()
+        self._closed = False
+    
+    def _acquire(self) -> NGADatabase:
+        """Take an idle connection, opening a new one while under the size limit."""
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        
+        with self._lock:
+            if self._opened < self.size:
+                self._opened += 1
+                open_new = True
+            else:
+                open_new = False
+        
+        if open_new:
+            try:
+                return NGADatabase(self.db_path, check_same_thread=False, read_only=self.read_only)
+            except Exception:
+                with self._lock:
+                    self._opened -= 1
+                raise
+        
+        # Pool exhausted: wait for another caller to hand one back
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise PoolTimeoutError(
+                f"No database connection available within {self.timeout}s (pool size {self.size})"
+            ) from None
+    
+    def _release(self, db: NGADatabase):
+        """Return a connection to the pool, or close it if the pool is shut down."""
+        if self._closed:
+            db.close()
+            return
+        self._idle.put_nowait(db)
+    
+    @contextmanager
+    def connection(self) -> Iterator[NGADatabase]:
+        """
+        Borrow a connection for the duration of a with-block.
+        
+        Yields:
+            NGADatabase instance owned by the pool
+        """
+        db = self._acquire()
+        try:
+            yield db
+        finally:
+            self._release(db)
+    
+    def close(self):
+        """Close all idle connections; borrowed ones are closed on return."""
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
 def parse_page_result(page_data: Dict[str, Any]) -> tuple[Dict[str, Any], List[Dict[str, Any]]]:
     """
     Parse API page result into thread and post data.
@@ -322,7 +856,8 @@ def parse_page_result(page_data: Dict[str, Any]) -> tuple[Dict[str, Any], List[D
     """
     # Extract thread information from top-level response
     # Note: tid is not at top level, need to get from first post
-    first_post = page_data.get('result', [{}])[0] if page_data.get('result') else {}
+    result = page_data.get('result') or []
+    first_post = result[0] if result else {}
     
     thread = {
         'tid': first_post.get('tid', 0),  # Get tid from first post
@@ -335,21 +870,20 @@ def parse_page_result(page_data: Dict[str, Any]) -> tuple[Dict[str, Any], List[D
     
     # Extract posts
     posts = []
-    for post in page_data.get('result', []):
-        author = post.get('author', {})
-        post_dict = {
+    for post in result:
+        # author may be missing or null
+        author = post.get('author') or {}
+        posts.append({
             'pid': post.get('pid', 0),
             'tid': post.get('tid', 0),
             'fid': post.get('fid', 0),
             'author_name': author.get('username', ''),
             'author_uid': author.get('uid', 0),
             'post_date': post.get('postdate', ''),
-            'post_date': post.get('postdate', ''),
             'post_timestamp': post.get('postdatetimestamp', 0),
             'content': post.get('content', ''),
             'post_number': post.get('lou', 0)
-        }
-        posts.append(post_dict)
+        })
     
     return thread, posts
 
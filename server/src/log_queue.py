@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Queue-backed logging for NGA Reminder.
+Log records are handed to a queue and written by a background thread, so
+crawling and database work never wait on console or log-file I/O.
+"""
+
+import atexit
+import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+
+def queue_handler(target: logging.Handler) -> QueueHandler:
+    """
+    Wrap a handler so records are written from a background listener thread.
+    
+    The listener is started immediately and stopped (draining the queue)
+    at interpreter exit.
+    
+    Args:
+        target: Handler that performs the actual output
+        
+    Returns:
+        QueueHandler to attach to loggers in place of target
+    """
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    listener = QueueListener(records, target, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+    return QueueHandler(records)
+
+
+def configure_cli_logging(level: int = logging.INFO):
+    """Print the "nga" loggers' records as plain lines, like the CLI's other output."""
+    import sys
+
+    target = logging.StreamHandler(sys.stdout)
+    target.setFormatter(logging.Formatter('%(message)s'))
+
+    nga_logger = logging.getLogger('nga')
+    nga_logger.addHandler(queue_handler(target))
+    nga_logger.setLevel(level)
+    nga_logger.propagate = False
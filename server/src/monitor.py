@@ -5,13 +5,83 @@ Periodically checks monitored threads for new posts.
 """
 
 import json
+import logging
+import os
 import time
 import argparse
+import hashlib
+import sqlite3
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import List, Dict, Any, Optional, Set
-from .database import NGADatabase, parse_page_result
+from typing import List, Dict, Any, Optional, Set, FrozenSet, Tuple
+import orjson
+from .database import NGADatabase, NGADatabasePool, parse_page_result
 from .nga_crawler import NGACrawler
 from .notification import NotificationManager
+from .log_queue import configure_cli_logging
+
+
+logger = logging.getLogger("nga.monitor")
+
+# Per-page progress during a backfill is logged for every Nth page only
+PAGE_LOG_EVERY = 10
+
+# Separator line around console and log blocks
+_BANNER = '=' * 80
+
+# run_loop logs the per-thread status table every Nth cycle only
+STATUS_LOG_EVERY = 6
+
+# Buffered monitoring events are flushed early once this many are pending
+EVENT_BUFFER_MAX = 500
+
+# run_loop refreshes the database's planner statistics this often (seconds)
+OPTIMIZE_EVERY = 3600
+
+
+# Statements run on every check cycle / event query. Kept as constants so
+# each call passes the identical string and hits sqlite3's statement cache
+_INSERT_EVENT_SQL = '''
+    INSERT INTO monitoring_events (tid, event_type, post_count, message, created_at)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+_SELECT_THREAD_EVENTS_SQL = '''
+    SELECT id, tid, event_type, post_count, message, created_at, NULL
+    FROM monitoring_events 
+    WHERE tid = ? 
+    ORDER BY created_at DESC 
+    LIMIT ?
+'''
+
+_SELECT_EVENTS_SQL = '''
+    SELECT e.id, e.tid, e.event_type, e.post_count, e.message, e.created_at, t.title 
+    FROM monitoring_events e
+    JOIN threads t ON e.tid = t.tid
+    ORDER BY e.created_at DESC 
+    LIMIT ?
+'''
+
+# One monitoring_events row as returned by get_events (title is None for
+# per-thread queries). Column order matches the _SELECT_*EVENTS_SQL queries
+Event = namedtuple('Event', 'id tid event_type post_count message created_at title')
+
+
+def _parse_uids(uids_csv: Optional[str]) -> FrozenSet[int]:
+    """Parse a comma-separated UID column (None or empty = no UIDs)."""
+    if not uids_csv:
+        return frozenset()
+    return frozenset(int(uid) for uid in uids_csv.split(','))
+
+
+def _check_record(tid: int, event_type: str, post_count: int, message: str,
+                  last_post_timestamp: int = 0) -> Tuple:
+    """Build a completed-check record for ThreadMonitor._write_checks, stamped with the current time."""
+    checked_ts = int(time.time())
+    checked_at = datetime.fromtimestamp(checked_ts).strftime('%Y-%m-%d %H:%M:%S')
+    return (tid, checked_at, checked_ts, last_post_timestamp, event_type, post_count, message)
 
 
 class ThreadMonitor:
@@ -25,25 +95,134 @@ class ThreadMonitor:
             db_path: Path to SQLite database
             config_path: Path to crawler config file
         """
-        self.db = NGADatabase(db_path)
-        self.crawler = NGACrawler(config_path)
         self.config_path = config_path
+        # Fingerprint of the config file as of the last complete sync
+        self.sync_state_path = os.path.join(os.path.dirname(db_path), '.sync_state')
+        self._config_cache = None
+        self._config_mtime = 0
+        config = self._load_config()
+        
+        # One writer connection shared by all checks (serialized by _write_lock),
+        # plus read-only connections so parallel checks can read concurrently
+        self.db = NGADatabase(db_path, check_same_thread=False,
+                              synchronous=config.get('pragma_synchronous', 'NORMAL'))
+        self._write_lock = threading.RLock()
+        self.crawler = NGACrawler(config_path)
         self._init_monitor_tables()
+        self.read_pool = NGADatabasePool(db_path, size=self.crawler.config['max_threads'], read_only=True)
+        
+        # run_loop checks due threads concurrently; the crawler's rate limiter
+        # still spaces out the actual requests
+        self._check_pool = ThreadPoolExecutor(max_workers=config.get('check_concurrency', 4),
+                                              thread_name_prefix='nga-check')
+        
+        # tid -> time.monotonic_ns() of the last successful check in run_loop
+        self._last_check_mono: Dict[int, int] = {}
+        
+        # Monitoring events not yet written, see _log_event / _flush_events
+        self._event_buffer: List[Tuple] = []
+        
+        # tid -> ((author_filter, author_notification) as stored, filter UIDs, notification UIDs)
+        self._filter_cache: Dict[int, Tuple[Tuple[Optional[str], Optional[str]], FrozenSet[int], FrozenSet[int]]] = {}
         
         # Initialize notification system
-        with open(config_path, 'r', encoding='utf-8') as f:
-            config = json.load(f)
         self.notification_manager = NotificationManager(config)
     
+    def _load_config(self) -> Dict[str, Any]:
+        """
+        Return the parsed config file, re-reading it only when its mtime changes.
+        
+        Raises:
+            FileNotFoundError: If the config file does not exist
+            json.JSONDecodeError: If the config file is not valid JSON
+        """
+        mtime = os.stat(self.config_path).st_mtime_ns
+        if self._config_cache is None or mtime != self._config_mtime:
+            with open(self.config_path, 'rb') as f:
+                self._config_cache = orjson.loads(f.read())
+            self._config_mtime = mtime
+        return self._config_cache
+    
+    def _config_file_mtime(self) -> Optional[int]:
+        """Return the config file's mtime in ns, or None if it can't be read."""
+        try:
+            return os.stat(self.config_path).st_mtime_ns
+        except OSError:
+            return None
+    
+    def config_changed_since_sync(self) -> Tuple[bool, Dict[str, Any]]:
+        """
+        Compare the config file against the fingerprint saved after the last full sync.
+        
+        The mtime is checked first so an untouched file is never read; when it
+        differs the content hash decides, so a plain touch does not force a sync.
+        
+        Returns:
+            Tuple of (changed, current fingerprint to pass to save_sync_state
+            after a successful sync)
+        """
+        try:
+            mtime_ns = os.stat(self.config_path).st_mtime_ns
+            with open(self.sync_state_path, 'rb') as f:
+                saved = orjson.loads(f.read())
+        except (OSError, orjson.JSONDecodeError):
+            saved = {}
+            mtime_ns = None
+        
+        if mtime_ns is not None and saved.get('mtime_ns') == mtime_ns:
+            return False, saved
+        
+        try:
+            with open(self.config_path, 'rb') as f:
+                digest = hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+            current = {'mtime_ns': os.stat(self.config_path).st_mtime_ns, 'hash': digest}
+        except OSError:
+            return True, {}
+        return saved.get('hash') != digest, current
+    
+    def save_sync_state(self, fingerprint: Dict[str, Any]):
+        """Persist the config fingerprint of a completed sync."""
+        if not fingerprint:
+            return
+        try:
+            with open(self.sync_state_path, 'wb') as f:
+                f.write(orjson.dumps(fingerprint))
+        except OSError:
+            logger.warning("Could not write %s", self.sync_state_path, exc_info=True)
+    
+    def reload_config(self) -> Dict[str, Any]:
+        """Drop the cached config and read the file again."""
+        self._config_cache = None
+        return self._load_config()
+    
+    def _author_uid_sets(self, monitor_config: Dict[str, Any]) -> Tuple[FrozenSet[int], FrozenSet[int]]:
+        """
+        Get the parsed author filter and notification UID sets of a monitored thread.
+        
+        Parsed sets are cached per tid and reused while the stored CSV columns
+        are unchanged, so polling does not re-split them on every check.
+        
+        Returns:
+            Tuple of (author_filter UIDs, author_notification UIDs); empty = none set
+        """
+        tid = monitor_config['tid']
+        columns = (monitor_config['author_filter'], monitor_config['author_notification'])
+        cached = self._filter_cache.get(tid)
+        if cached is None or cached[0] != columns:
+            cached = (columns, _parse_uids(columns[0]), _parse_uids(columns[1]))
+            self._filter_cache[tid] = cached
+        return cached[1], cached[2]
+    
     def _init_monitor_tables(self):
         """Initialize monitoring tables if they don't exist."""
-        self.db.cursor.executescript('''
+        self.db.conn.executescript('''
             CREATE TABLE IF NOT EXISTS monitored_threads (
                 tid INTEGER PRIMARY KEY,
                 author_filter TEXT,
                 author_notification TEXT,
                 check_interval INTEGER DEFAULT 300,
                 last_checked TIMESTAMP,
+                last_checked_ts INTEGER,
                 last_post_timestamp INTEGER DEFAULT 0,
                 is_active BOOLEAN DEFAULT 1,
                 created_at TIMESTAMP DEFAULT (datetime('now', 'localtime')),
@@ -63,8 +242,56 @@ class ThreadMonitor:
             CREATE INDEX IF NOT EXISTS idx_monitored_active ON monitored_threads(is_active);
             CREATE INDEX IF NOT EXISTS idx_monitoring_events_tid ON monitoring_events(tid);
         ''')
+        
+        # last_checked_ts (UNIX time of last_checked) was added later; derive it
+        # for existing rows from the local-time last_checked text
+        columns = {row['name'] for row in self.db.conn.execute('PRAGMA table_info(monitored_threads)')}
+        if 'last_checked_ts' not in columns:
+            self.db.conn.executescript('''
+                ALTER TABLE monitored_threads ADD COLUMN last_checked_ts INTEGER;
+                UPDATE monitored_threads
+                SET last_checked_ts = CAST(strftime('%s', last_checked, 'utc') AS INTEGER)
+                WHERE last_checked IS NOT NULL;
+            ''')
+        self.db.conn.execute(
+            'CREATE INDEX IF NOT EXISTS idx_monitored_due ON monitored_threads(is_active, last_checked_ts)'
+        )
         self.db.conn.commit()
     
+    def _fetch_pages(self, tid: int, start_page: int, end_page: int,
+                     stop_event=None) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Fetch and parse a range of pages without touching the database.
+        
+        Pages are collected first so the caller can save them in one short
+        transaction instead of holding the write lock across the crawl.
+        
+        Args:
+            tid: Thread ID
+            start_page: First page number (inclusive)
+            end_page: Last page number (inclusive)
+            stop_event: Optional threading.Event to signal early stop
+            
+        Returns:
+            Page number -> parsed posts, for the pages that returned posts
+        """
+        pages: Dict[int, List[Dict[str, Any]]] = {}
+        
+        def collect_page(page_num, parsed_page):
+            if not parsed_page:
+                logger.warning("  ✗ Page %d: Failed to fetch", page_num)
+                return
+            _, posts_data = parsed_page
+            if posts_data:
+                pages[page_num] = posts_data
+            else:
+                logger.warning("  ⚠ Page %d: No posts found", page_num)
+        
+        # Pages are parsed on the fetch workers; the callback only collects them
+        self.crawler.crawl_pages_range_with_callback(tid, start_page, end_page, collect_page,
+                                                     stop_event=stop_event, parse=parse_page_result)
+        return pages
+    
     def add_thread(self, tid: int, author_filter: Optional[List[int]] = None, 
                    check_interval: int = 300, author_notification: Optional[List[int]] = None, 
                    stop_event=None) -> bool:
@@ -83,130 +310,98 @@ class ThreadMonitor:
             True if successful
         """
         try:
-            print(f"Fetching thread {tid}...")
+            logger.info("Fetching thread %d...", tid)
             
             # Fetch first page to get thread info
             first_page = self.crawler.fetch_page(tid, 1)
             if not first_page:
-                print("Failed to fetch thread info")
+                logger.error("Failed to fetch thread info")
                 return False
             
             # Get thread data
             thread_data, first_page_posts = parse_page_result(first_page)
-            
-            # Save thread info immediately
-            self.db.save_thread(thread_data)
-            
             total_pages = thread_data['total_pages']
             total_posts = thread_data['total_posts']
             
-            print(f"✓ Thread: {thread_data['title']}")
-            print(f"✓ Total pages: {total_pages}")
-            print(f"✓ Total posts: {total_posts}")
-            
-            # Save first page posts
-            if first_page_posts:
-                saved = self.db.save_posts_batch(first_page_posts)
-                print(f"  Saved page 1: {saved} posts")
+            logger.info("✓ Thread: %s", thread_data['title'])
+            logger.info("✓ Total pages: %d", total_pages)
+            logger.info("✓ Total posts: %d", total_posts)
             
-            latest_timestamp = max((p['post_timestamp'] for p in first_page_posts), default=0)
-            
-            print(f"DEBUG: After page 1, total_pages={total_pages}")
-            
-            # Fetch and save remaining pages in batches
+            pages = {1: first_page_posts} if first_page_posts else {}
             if total_pages > 1:
-                print(f"DEBUG: Entering batch fetch for pages 2-{total_pages}")
-                print(f"Fetching pages 2-{total_pages}...")
-                
-                # Use callback to save posts immediately as each page completes
-                def save_page_callback(page_num, page_result):
-                    """Callback to save posts immediately when a page is fetched."""
-                    nonlocal latest_timestamp
-                    if page_result:
-                        _, posts_data = parse_page_result(page_result)
-                        if posts_data:
-                            saved = self.db.save_posts_batch(posts_data)
-                            print(f"  ✓ Saved page {page_num}: {saved} posts")
-                            
-                            # Update latest timestamp
-                            page_latest = max((p['post_timestamp'] for p in posts_data), default=0)
-                            if page_latest > latest_timestamp:
-                                latest_timestamp = page_latest
-                        else:
-                            print(f"  ⚠ Page {page_num}: No posts found")
-                    else:
-                        print(f"  ✗ Page {page_num}: Failed to fetch")
-                
-                # Fetch with callback
-                self.crawler.crawl_pages_range_with_callback(tid, 2, total_pages, save_page_callback, stop_event=stop_event)
+                logger.info("Fetching pages 2-%d...", total_pages)
+                pages.update(self._fetch_pages(tid, 2, total_pages, stop_event=stop_event))
             
-            # Count total saved posts
-            self.db.cursor.execute('SELECT COUNT(*) FROM posts WHERE tid = ?', (tid,))
-            saved_count = self.db.cursor.fetchone()[0]
-            print(f"✓ Total saved: {saved_count} posts")
-            
-            # Add to monitoring
+            latest_timestamp = max(
+                (p['post_timestamp'] for posts_data in pages.values() for p in posts_data), default=0
+            )
             author_filter_str = ','.join(map(str, author_filter)) if author_filter else None
             author_notification_str = ','.join(map(str, author_notification)) if author_notification else None
             
-            self.db.cursor.execute('''
-                INSERT INTO monitored_threads (
-                    tid, author_filter, author_notification, check_interval, 
-                    last_checked, last_post_timestamp
-                ) VALUES (?, ?, ?, ?, datetime('now', 'localtime'), ?)
-                ON CONFLICT(tid) DO UPDATE SET
-                    author_filter = excluded.author_filter,
-                    author_notification = excluded.author_notification,
-                    check_interval = excluded.check_interval,
-                    is_active = 1,
-                    last_checked = datetime('now', 'localtime'),
-                    last_post_timestamp = excluded.last_post_timestamp
-            ''', (tid, author_filter_str, author_notification_str, check_interval, latest_timestamp))
-            
-            self.db.conn.commit()
+            # The write lock is only taken once every page is fetched, so checks
+            # and other writers are not blocked behind the crawl. All pages are
+            # saved in one transaction: one commit instead of one per page, and
+            # a failure part way through leaves no half-added thread behind
+            with self._write_lock, self.db.transaction():
+                self.db.save_thread(thread_data)
+                
+                # saved_count tallies the run instead of counting the thread's rows afterwards
+                saved_count = 0
+                for page_num in sorted(pages):
+                    saved = self.db.save_posts_batch(pages[page_num])
+                    saved_count += saved
+                    if page_num == 1 or page_num % PAGE_LOG_EVERY == 0:
+                        logger.info("  ✓ Saved page %d: %d posts", page_num, saved)
+                
+                logger.info("✓ Total saved: %d posts", saved_count)
+                
+                # Add to monitoring
+                self.db.conn.execute('''
+                    INSERT INTO monitored_threads (
+                        tid, author_filter, author_notification, check_interval, 
+                        last_checked, last_checked_ts, last_post_timestamp
+                    ) VALUES (?, ?, ?, ?, datetime('now', 'localtime'), CAST(strftime('%s', 'now') AS INTEGER), ?)
+                    ON CONFLICT(tid) DO UPDATE SET
+                        author_filter = excluded.author_filter,
+                        author_notification = excluded.author_notification,
+                        check_interval = excluded.check_interval,
+                        is_active = 1,
+                        last_checked = datetime('now', 'localtime'),
+                        last_checked_ts = excluded.last_checked_ts,
+                        last_post_timestamp = excluded.last_post_timestamp
+                ''', (tid, author_filter_str, author_notification_str, check_interval, latest_timestamp))
+            self._filter_cache.pop(tid, None)
             
-            print(f"✓ Thread {tid} added to monitoring")
-            print(f"  Title: {thread_data['title']}")
-            print(f"  Author: {thread_data['author_name']}")
-            print(f"  Filter: {author_filter if author_filter else 'All authors'}")
-            print(f"  Notify: {author_notification if author_notification else 'All authors'}")
-            print(f"  Check interval: {check_interval}s")
+            logger.info("✓ Thread %d added to monitoring", tid)
+            logger.info("  Title: %s", thread_data['title'])
+            logger.info("  Author: %s", thread_data['author_name'])
+            logger.info("  Filter: %s", author_filter if author_filter else 'All authors')
+            logger.info("  Notify: %s", author_notification if author_notification else 'All authors')
+            logger.info("  Check interval: %ds", check_interval)
             
             return True
         except Exception as e:
-            print(f"Error adding thread: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error adding thread: %s", e)
             return False
     
     def remove_thread(self, tid: int) -> bool:
         """Remove thread from monitoring."""
         try:
-            self.db.cursor.execute(
+            self.db.conn.execute(
                 'UPDATE monitored_threads SET is_active = 0 WHERE tid = ?',
                 (tid,)
             )
             self.db.conn.commit()
+            self._filter_cache.pop(tid, None)
             print(f"✓ Thread {tid} removed from monitoring")
             return True
         except Exception as e:
             print(f"Error removing thread: {e}")
             return False
     
-    def list_monitored(self) -> List[Dict[str, Any]]:
-        """Get list of monitored threads."""
-        self.db.cursor.execute('''
-            SELECT 
-                m.*,
-                t.title,
-                t.author_name,
-                t.total_posts
-            FROM monitored_threads m
-            JOIN threads t ON m.tid = t.tid
-            WHERE m.is_active = 1
-            ORDER BY m.last_checked DESC
-        ''')
-        return [dict(row) for row in self.db.cursor.fetchall()]
+    def list_monitored(self) -> List[sqlite3.Row]:
+        """Get list of monitored threads (rows joined with their thread's title, author and total_posts)."""
+        return self.db.get_monitored_thread_rows()
     
     def load_from_config(self, config_path: Optional[str] = None, stop_event=None) -> Dict[str, Any]:
         """
@@ -222,8 +417,11 @@ class ThreadMonitor:
         config_path = config_path or self.config_path
         
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
+            if config_path == self.config_path:
+                config = self._load_config()
+            else:
+                with open(config_path, 'rb') as f:
+                    config = orjson.loads(f.read())
         except FileNotFoundError:
             return {'error': f'Config file not found: {config_path}'}
         except json.JSONDecodeError as e:
@@ -239,12 +437,12 @@ class ThreadMonitor:
         skipped = 0
         errors = []
         
-        print(f"\nSyncing {len(monitored_threads)} thread(s) from config...\n")
+        logger.info("Syncing %d thread(s) from config...", len(monitored_threads))
         
         for thread_config in monitored_threads:
             # Check if we should stop
             if stop_event and stop_event.is_set():
-                print("\n⚠ Sync interrupted by stop signal")
+                logger.warning("⚠ Sync interrupted by stop signal")
                 break
             
             tid = thread_config.get('tid')
@@ -255,145 +453,35 @@ class ThreadMonitor:
             enabled = thread_config.get('enabled', True)
             
             if not enabled:
-                print(f"  ⊘ TID {tid}: Skipped (disabled in config)")
+                logger.info("  ⊘ TID %d: Skipped (disabled in config)", tid)
                 skipped += 1
                 continue
             
             author_filter = thread_config.get('author_filter')
             check_interval = thread_config.get('check_interval', 300)
             
-            # Check if already monitored
-            self.db.cursor.execute(
-                'SELECT tid FROM monitored_threads WHERE tid = ?',
-                (tid,)
-            )
-            existing = self.db.cursor.fetchone()
+            author_filter_str = ','.join(map(str, author_filter)) if author_filter else None
+            author_notification_str = ','.join(map(str, thread_config.get('author_notification', []))) if thread_config.get('author_notification') else None
             
-            # Check if posts already exist and get max post_number
-            self.db.cursor.execute(
-                'SELECT COUNT(*), MAX(post_number) FROM posts WHERE tid = ?',
-                (tid,)
-            )
-            row = self.db.cursor.fetchone()
-            post_count = row[0]
-            max_post_number = row[1] if row[1] is not None else -1
+            # Check if already monitored, and get the max stored post_number
+            # (MAX is answered from the end of a (tid, post_number) index; COUNT scans every post)
+            with self._write_lock:
+                existing = self.db.conn.execute(
+                    'SELECT tid FROM monitored_threads WHERE tid = ?',
+                    (tid,)
+                ).fetchone()
+                row = self.db.conn.execute(
+                    'SELECT MAX(post_number) FROM posts WHERE tid = ?',
+                    (tid,)
+                ).fetchone()
+            max_post_number = row[0] if row[0] is not None else -1
             
-            if post_count > 0:
-                # We have some posts - check if we need to fetch more
-                print(f"  ○ TID {tid}: Found {post_count} existing posts (up to post #{max_post_number})")
-                
-                # Fetch page 1 to check current state
-                first_page = self.crawler.fetch_page(tid, 1)
-                if not first_page:
-                    print(f"    ✗ Failed to fetch page 1, skipping sync")
-                    errors.append(f'Failed to fetch thread {tid}')
-                    continue
-                
-                thread_data, _ = parse_page_result(first_page)
-                current_total_posts = thread_data['total_posts']
-                current_total_pages = thread_data['total_pages']
-                
-                if max_post_number >= current_total_posts - 1:
-                    # We have all posts (post_number is 0-indexed)
-                    print(f"    ✓ Already up to date ({current_total_posts} posts)")
-                    
-                    # Update or insert into monitored_threads
-                    author_filter_str = ','.join(map(str, author_filter)) if author_filter else None
-                    author_notification_str = ','.join(map(str, thread_config.get('author_notification', []))) if thread_config.get('author_notification') else None
-                    
-                    # Get latest post timestamp
-                    self.db.cursor.execute(
-                        'SELECT MAX(post_timestamp) FROM posts WHERE tid = ?',
-                        (tid,)
-                    )
-                    latest_timestamp = self.db.cursor.fetchone()[0] or 0
-                    
-                    if existing:
-                        self.db.cursor.execute('''
-                            UPDATE monitored_threads SET
-                                author_filter = ?,
-                                author_notification = ?,
-                                check_interval = ?,
-                                is_active = 1
-                            WHERE tid = ?
-                        ''', (author_filter_str, author_notification_str, check_interval, tid))
-                        updated += 1
-                    else:
-                        self.db.cursor.execute('''
-                            INSERT INTO monitored_threads (
-                                tid, author_filter, author_notification, check_interval,
-                                last_checked, last_post_timestamp
-                            ) VALUES (?, ?, ?, ?, datetime('now', 'localtime'), ?)
-                        ''', (tid, author_filter_str, author_notification_str, check_interval, latest_timestamp))
-                        added += 1
-                    
-                    self.db.conn.commit()
-                else:
-                    # Need to fetch missing posts
-                    missing_posts = current_total_posts - (max_post_number + 1)
-                    print(f"    ⟳ Need to fetch {missing_posts} new posts (current total: {current_total_posts})")
-                    
-                    # Calculate which pages to fetch
-                    posts_per_page = first_page.get('perPage', 20)
-                    # Start from page containing post after max_post_number
-                    start_page = (max_post_number // posts_per_page) + 1
-                    if start_page < 1:
-                        start_page = 1
-                    
-                    print(f"    Fetching pages {start_page}-{current_total_pages}...")
-                    
-                    # Update thread info
-                    self.db.save_thread(thread_data)
-                    
-                    # Fetch missing pages with callback
-                    def save_page_callback(page_num, page_result):
-                        if page_result:
-                            _, posts_data = parse_page_result(page_result)
-                            if posts_data:
-                                # Only save posts we don't have yet
-                                new_posts = [p for p in posts_data if p['post_number'] > max_post_number]
-                                if new_posts:
-                                    saved = self.db.save_posts_batch(new_posts)
-                                    print(f"      ✓ Saved page {page_num}: {saved} new posts")
-                    
-                    self.crawler.crawl_pages_range_with_callback(tid, start_page, current_total_pages, save_page_callback, stop_event=stop_event)
-                    
-                    # Update monitored_threads
-                    author_filter_str = ','.join(map(str, author_filter)) if author_filter else None
-                    author_notification_str = ','.join(map(str, thread_config.get('author_notification', []))) if thread_config.get('author_notification') else None
-                    
-                    self.db.cursor.execute(
-                        'SELECT MAX(post_timestamp) FROM posts WHERE tid = ?',
-                        (tid,)
-                    )
-                    latest_timestamp = self.db.cursor.fetchone()[0] or 0
-                    
-                    if existing:
-                        self.db.cursor.execute('''
-                            UPDATE monitored_threads SET
-                                author_filter = ?,
-                                author_notification = ?,
-                                check_interval = ?,
-                                is_active = 1
-                            WHERE tid = ?
-                        ''', (author_filter_str, author_notification_str, check_interval, tid))
-                        updated += 1
-                    else:
-                        self.db.cursor.execute('''
-                            INSERT INTO monitored_threads (
-                                tid, author_filter, author_notification, check_interval,
-                                last_checked, last_post_timestamp
-                            ) VALUES (?, ?, ?, ?, datetime('now', 'localtime'), ?)
-                        ''', (tid, author_filter_str, author_notification_str, check_interval, latest_timestamp))
-                        added += 1
-                    
-                    self.db.conn.commit()
-            else:
+            if max_post_number < 0:
                 # No posts (new thread OR empty monitored thread) - fetch all pages
                 if existing:
-                    print(f"  ⚠ TID {tid}: In monitoring but no posts found, re-fetching...")
+                    logger.warning("  ⚠ TID %d: In monitoring but no posts found, re-fetching...", tid)
                 else:
-                    print(f"  + TID {tid}: Adding to monitoring (fetch all pages)")
+                    logger.info("  + TID %d: Adding to monitoring (fetch all pages)", tid)
                 
                 success = self.add_thread(tid, author_filter, check_interval, 
                                         author_notification=thread_config.get('author_notification'),
@@ -402,18 +490,90 @@ class ThreadMonitor:
                     added += 1
                 else:
                     errors.append(f'Failed to add thread {tid}')
-
+                continue
+            
+            # We have some posts - check if we need to fetch more
+            logger.info("  ○ TID %d: Found existing posts (up to post #%d)", tid, max_post_number)
+            
+            # Fetch page 1 to check current state
+            first_page = self.crawler.fetch_page(tid, 1)
+            if not first_page:
+                logger.warning("    ✗ Failed to fetch page 1, skipping sync")
+                errors.append(f'Failed to fetch thread {tid}')
+                continue
+            
+            thread_data, _ = parse_page_result(first_page)
+            current_total_posts = thread_data['total_posts']
+            current_total_pages = thread_data['total_pages']
+            
+            pages = None
+            if max_post_number >= current_total_posts - 1:
+                # We have all posts (post_number is 0-indexed)
+                logger.info("    ✓ Already up to date (%d posts)", current_total_posts)
+            else:
+                # Need to fetch missing posts
+                missing_posts = current_total_posts - (max_post_number + 1)
+                logger.info("    ⟳ Need to fetch %d new posts (current total: %d)", missing_posts, current_total_posts)
+                
+                # Start from the page holding the first missing post (0-indexed
+                # post_number max_post_number + 1), so a stored thread that ends
+                # on a page boundary doesn't refetch its last full page
+                posts_per_page = first_page.get('perPage', 20)
+                start_page = (max_post_number + 1) // posts_per_page + 1
+                
+                logger.info("    Fetching pages %d-%d...", start_page, current_total_pages)
+                pages = self._fetch_pages(tid, start_page, current_total_pages, stop_event=stop_event)
+            
+            # The crawl is done before the write lock is taken, so checks and
+            # other writers only wait for the saves. One commit per thread
+            with self._write_lock, self.db.transaction():
+                if pages is not None:
+                    # Update thread info
+                    self.db.save_thread(thread_data)
+                    for page_num in sorted(pages):
+                        # Posts we already have are skipped by the pid primary key
+                        saved = self.db.save_posts_batch(pages[page_num], ignore_existing=True)
+                        if page_num % PAGE_LOG_EVERY == 0:
+                            logger.info("      ✓ Saved page %d: %d new posts", page_num, saved)
+                
+                latest_timestamp = self.db.conn.execute(
+                    'SELECT MAX(post_timestamp) FROM posts WHERE tid = ?',
+                    (tid,)
+                ).fetchone()[0] or 0
+                
+                # Update or insert into monitored_threads
+                if existing:
+                    self.db.conn.execute('''
+                        UPDATE monitored_threads SET
+                            author_filter = ?,
+                            author_notification = ?,
+                            check_interval = ?,
+                            is_active = 1
+                        WHERE tid = ?
+                    ''', (author_filter_str, author_notification_str, check_interval, tid))
+                    updated += 1
+                else:
+                    self.db.conn.execute('''
+                        INSERT INTO monitored_threads (
+                            tid, author_filter, author_notification, check_interval,
+                            last_checked, last_checked_ts, last_post_timestamp
+                        ) VALUES (?, ?, ?, ?, datetime('now', 'localtime'), CAST(strftime('%s', 'now') AS INTEGER), ?)
+                    ''', (tid, author_filter_str, author_notification_str, check_interval, latest_timestamp))
+                    added += 1
+        
+        # Filters may have changed for any synced thread
+        self._filter_cache.clear()
         
-        print(f"\n{'='*80}")
-        print(f"Sync complete:")
-        print(f"  Added: {added}")
-        print(f"  Updated: {updated}")
-        print(f"  Skipped: {skipped}")
+        logger.info(_BANNER)
+        logger.info("Sync complete:")
+        logger.info("  Added: %d", added)
+        logger.info("  Updated: %d", updated)
+        logger.info("  Skipped: %d", skipped)
         if errors:
-            print(f"  Errors: {len(errors)}")
+            logger.info("  Errors: %d", len(errors))
             for err in errors:
-                print(f"    - {err}")
-        print(f"{'='*80}")
+                logger.info("    - %s", err)
+        logger.info(_BANNER)
         
         return {
             'added': added,
@@ -422,7 +582,10 @@ class ThreadMonitor:
             'errors': errors
         }
     
-    def check_thread(self, tid: int, verbose: bool = True) -> Dict[str, Any]:
+    def check_thread(self, tid: int, verbose: bool = True,
+                     monitor_config: Optional[Dict[str, Any]] = None,
+                     thread: Optional[Dict[str, Any]] = None,
+                     defer_commit: bool = False) -> Dict[str, Any]:
         """
         Check a single thread for new posts.
         Compares vrows (total posts) and fetches only new pages if needed.
@@ -430,40 +593,41 @@ class ThreadMonitor:
         Args:
             tid: Thread ID
             verbose: Print detailed output
-            
+            monitor_config: Monitored thread row, if the caller already has it
+                (e.g. from list_monitored); skips the per-thread lookups
+            thread: Stored thread row (title, total_posts), likewise
+            defer_commit: Don't write last_checked and the check event; return
+                them as result['check'] for the caller to pass to _write_checks
+                (check_all writes a whole cycle's checks in one commit)
+        
         Returns:
             Dictionary with check results
         """
-        # Get monitoring config and thread data
-        self.db.cursor.execute(
-            'SELECT * FROM monitored_threads WHERE tid = ? AND is_active = 1',
-            (tid,)
-        )
-        monitor_config = self.db.cursor.fetchone()
+        # Get monitoring config and thread data unless the caller passed them
+        if monitor_config is None or thread is None:
+            with self.read_pool.connection() as rdb:
+                monitor_config = rdb.conn.execute(
+                    'SELECT * FROM monitored_threads WHERE tid = ? AND is_active = 1',
+                    (tid,)
+                ).fetchone()
+                thread = rdb.get_thread(tid)
         
         if not monitor_config:
             return {'error': f'Thread {tid} not monitored'}
         
-        monitor_config = dict(monitor_config)
-        author_filter = monitor_config['author_filter']
-        
-        # Parse author filter
-        author_uids = set()
-        if author_filter:
-            author_uids = set(int(uid) for uid in author_filter.split(','))
+        author_uids, notification_uids = self._author_uid_sets(monitor_config)
         
-        # Get stored thread data
-        thread = self.db.get_thread(tid)
+        # Check stored thread data
         if not thread:
             return {'error': f'Thread {tid} not found in database'}
         
         old_total_posts = thread['total_posts']
         
         if verbose:
-            print(f"\n{'='*80}")
+            print(f"\n{_BANNER}")
             print(f"Checking thread {tid}: {thread['title']}")
-            print(f"{'='*80}")
-            print(f"Last check: {monitor_config.get('last_checked', 'Never')}")
+            print(f"{_BANNER}")
+            print(f"Last check: {monitor_config['last_checked'] or 'Never'}")
             print(f"Stored total posts: {old_total_posts}")
         
         try:
@@ -487,42 +651,39 @@ class ThreadMonitor:
             new_post_count = current_total_posts - old_total_posts
             
             if new_post_count <= 0:
-                # No new posts
-                self.db.cursor.execute(
-                    'UPDATE monitored_threads SET last_checked = datetime(\'now\', \'localtime\') WHERE tid = ?',
-                    (tid,)
-                )
-                self._log_event(tid, 'check', 0, 'No new posts')
-                
-                # Update thread stats
-                thread_data, _ = parse_page_result(first_page)
-                self.db.save_thread(thread_data)
-                self.db.conn.commit()
+                # No new posts. An unchanged thread (the common case) skips
+                # parsing page 1 and rewriting the thread row
+                check = _check_record(tid, 'check', 0, 'No new posts')
+                if new_post_count < 0 or not defer_commit:
+                    with self._write_lock:
+                        if new_post_count < 0:
+                            # Posts were removed; refresh the stored thread stats
+                            thread_data, _ = parse_page_result(first_page)
+                            self.db.save_thread(thread_data)
+                        if not defer_commit:
+                            self._write_checks([check])
+                        self.db.conn.commit()
                 
                 if verbose:
                     print(f"\n✓ No new posts")
                 
-                return {
+                result = {
                     'tid': tid,
                     'new_posts': 0,
                     'total_posts': current_total_posts,
                     'posts': []
                 }
+                if defer_commit:
+                    result['check'] = check
+                return result
             
             if verbose:
                 print(f"\n🔔 Found {new_post_count} new post(s)!")
                 print(f"Fetching new pages...")
             
-            # Calculate which pages to fetch
-            # Old last page
-            old_last_page = (old_total_posts + posts_per_page - 1) // posts_per_page
-            
-            # Pages that might contain new posts
-            # We need to fetch from the page where new posts might start
-            # Start from the page that would contain post at position (old_total_posts + 1)
-            start_page = max(1, (old_total_posts // posts_per_page) + 1)
-            if old_total_posts % posts_per_page == 0 and old_total_posts > 0:
-                start_page = old_last_page + 1
+            # Calculate which pages to fetch: start from the page holding the
+            # first new post (0-indexed position old_total_posts)
+            start_page = old_total_posts // posts_per_page + 1
             
             end_page = current_total_pages
             
@@ -549,63 +710,58 @@ class ThreadMonitor:
             new_posts_to_save = []
             filtered_new_posts = []
             
+            # Look up which fetched posts are already stored in one query
+            with self.read_pool.connection() as rdb:
+                existing_pids = rdb.get_existing_pids(p['pid'] for p in all_new_posts)
+            
             for post in all_new_posts:
-                # Check if post already exists
-                existing = self.db.cursor.execute(
-                    'SELECT pid FROM posts WHERE pid = ?',
-                    (post['pid'],)
-                ).fetchone()
-                
-                if not existing:
+                if post['pid'] not in existing_pids:
                     new_posts_to_save.append(post)
                     
                     # Check author filter for notification
                     if not author_uids or post['author_uid'] in author_uids:
                         filtered_new_posts.append(post)
             
-            # Save new posts
-            if new_posts_to_save:
-                saved_count = self.db.save_posts_batch(new_posts_to_save)
-                if verbose:
-                    print(f"\n✓ Saved {saved_count} new posts to database")
-            
-            # Update thread data
             thread_data, _ = parse_page_result(first_page)
-            self.db.save_thread(thread_data)
-            
-            # Update monitoring state
-            self.db.cursor.execute(
-                'UPDATE monitored_threads SET last_checked = datetime(\'now\', \'localtime\') WHERE tid = ?',
-                (tid,)
-            )
-            
-            # Log event
-            if filtered_new_posts:
-                self._log_event(tid, 'new_post', len(filtered_new_posts), 
-                              f'Found {len(filtered_new_posts)} new posts (filtered by author)')
-            else:
-                self._log_event(tid, 'check', len(new_posts_to_save), 
-                              f'Found {len(new_posts_to_save)} new posts (none match filter)')
-            
-            self.db.conn.commit()
+            with self._write_lock:
+                # Save new posts
+                if new_posts_to_save:
+                    saved_count = self.db.save_posts_batch(new_posts_to_save)
+                    if verbose:
+                        print(f"\n✓ Saved {saved_count} new posts to database")
+                
+                # Update thread data
+                self.db.save_thread(thread_data)
+                
+                # Update monitoring state and log event
+                last_post_timestamp = max((p['post_timestamp'] for p in new_posts_to_save), default=0)
+                if filtered_new_posts:
+                    check = _check_record(tid, 'new_post', len(filtered_new_posts),
+                                          f'Found {len(filtered_new_posts)} new posts (filtered by author)',
+                                          last_post_timestamp)
+                else:
+                    check = _check_record(tid, 'check', len(new_posts_to_save),
+                                          f'Found {len(new_posts_to_save)} new posts (none match filter)',
+                                          last_post_timestamp)
+                if not defer_commit:
+                    self._write_checks([check])
+                
+                self.db.conn.commit()
             
             # Send notifications for posts matching author_notification
-            author_notification = monitor_config.get('author_notification')
-            if author_notification:
-                notification_uids = set(int(uid) for uid in author_notification.split(','))
-                
-                for post in filtered_new_posts:
-                    if post['author_uid'] in notification_uids:
-                        # Send notification
-                        title = f"📬 {thread['title']}"
-                        message = f"{post['author_name']}: {post['content'][:100]}"
-                        url = f"https://bbs.nga.cn/read.php?tid={tid}&pid={post['pid']}"
-                        
-                        self.notification_manager.send(
-                            title=title,
-                            message=message,
-                            url=url
-                        )
+            # (messages are only built if some sender will receive them)
+            if notification_uids and self.notification_manager.has_senders():
+                notifications = [
+                    {
+                        'title': f"📬 {thread['title']}",
+                        'message': f"{post['author_name']}: {post['content'][:100]}",
+                        'url': f"https://bbs.nga.cn/read.php?tid={tid}&pid={post['pid']}"
+                    }
+                    for post in filtered_new_posts
+                    if post['author_uid'] in notification_uids
+                ]
+                if notifications:
+                    self.notification_manager.send_many(notifications)
             
             # Display filtered new posts
             if verbose and filtered_new_posts:
@@ -619,13 +775,16 @@ class ThreadMonitor:
             elif verbose and new_posts_to_save and not filtered_new_posts:
                 print(f"\n  ℹ️  {len(new_posts_to_save)} new posts found, but none match author filter")
             
-            return {
+            result = {
                 'tid': tid,
                 'new_posts': len(filtered_new_posts),
                 'total_new_posts': len(new_posts_to_save),
                 'total_posts': current_total_posts,
                 'posts': filtered_new_posts
             }
+            if defer_commit:
+                result['check'] = check
+            return result
             
         except Exception as e:
             error_msg = f'Error checking thread: {e}'
@@ -639,9 +798,12 @@ class ThreadMonitor:
     def check_all(self, verbose: bool = True) -> Dict[str, Any]:
         """
         Check all active monitored threads.
+        Threads are checked in parallel on the check pool, at most
+        check_concurrency at a time; the crawler's rate limit still spaces
+        out the requests to NGA.
         
         Args:
-            verbose: Print detailed output
+            verbose: Print a summary line for each thread as its check completes
             
         Returns:
             Summary of checks
@@ -657,18 +819,37 @@ class ThreadMonitor:
         total_new = 0
         checked = 0
         
-        for thread in monitored:
-            result = self.check_thread(thread['tid'], verbose=verbose)
+        # Checks run non-verbose (concurrent output would interleave); each
+        # thread's summary is printed as it completes. list_monitored already
+        # joined each config with its thread row
+        futures = {
+            self._check_pool.submit(self.check_thread, t['tid'], verbose=False,
+                                    monitor_config=t, thread=t, defer_commit=True): t
+            for t in monitored
+        }
+        checks = []
+        for future in as_completed(futures):
+            thread = futures[future]
+            result = future.result()
             if 'new_posts' in result:
                 total_new += result['new_posts']
                 checked += 1
-            
-            # Small delay between checks
-            time.sleep(1)
+            if 'check' in result:
+                checks.append(result.pop('check'))
+            if verbose:
+                status = f"✗ {result['error']}" if 'error' in result else f"✓ {result['new_posts']} new post(s)"
+                print(f"Thread {thread['tid']}: {thread['title']} - {status}")
+        
+        # Record the whole cycle's checks in one commit instead of one per thread
+        if checks:
+            with self._write_lock:
+                self._write_checks(checks)
+                self.db.conn.commit()
+        self._flush_events()
         
-        print(f"\n{'='*80}")
+        print(f"\n{_BANNER}")
         print(f"Summary: Checked {checked} threads, found {total_new} new post(s)")
-        print(f"{'='*80}")
+        print(f"{_BANNER}")
         
         return {
             'total': len(monitored),
@@ -681,140 +862,200 @@ class ThreadMonitor:
         Run monitoring loop continuously.
         Respects per-thread check_interval from database.
         
+        Between cycles the loop sleeps until the earliest thread is due
+        rather than for a fixed period, so threads are checked on time and
+        idle wakeups are avoided. When the config file's mtime changes, its
+        monitored_threads are synced (load_from_config) before the next cycle.
+        
         Args:
-            check_all_interval: Seconds between checking which threads need updates (default: 10)
+            check_all_interval: Maximum seconds between re-reading which threads
+                need updates, so threads added elsewhere are picked up (default: 10)
             stop_event: Optional threading.Event to signal loop to stop
         """
-        print(f"Starting monitoring loop")
-        print("Each thread will be checked according to its own check_interval")
-        if stop_event is None:
-            print("Press Ctrl+C to stop\n")
-        else:
-            print("Monitoring will stop when server shuts down\n")
+        logger.info("Starting monitoring loop\n"
+                    "Each thread will be checked according to its own check_interval\n%s",
+                    "Press Ctrl+C to stop" if stop_event is None else "Monitoring will stop when server shuts down")
         
+        cycle = 0
+        synced_config_mtime = self._config_file_mtime()
+        last_optimize = time.monotonic()
         try:
             while True:
                 # Check if we should stop
                 if stop_event and stop_event.is_set():
-                    print("\nMonitoring loop stopped by signal")
+                    logger.info("Monitoring loop stopped by signal")
                     break
-                # Get all monitored threads with their configuration
-                monitored = self.list_monitored()
-                
-                if not monitored:
-                    print("No threads being monitored. Waiting...")
-                    time.sleep(check_all_interval)
-                    continue
                 
-                # Check each thread if its interval has passed
-                current_time = time.time()
-                threads_to_check = []
-                
-                for thread in monitored:
-                    tid = thread['tid']
-                    check_interval = thread['check_interval']
-                    last_checked = thread['last_checked']
-                    
-                    # Parse last_checked time
-                    if last_checked:
-                        try:
-                            # SQLite datetime format: 'YYYY-MM-DD HH:MM:SS'
-                            from datetime import datetime
-                            last_check_dt = datetime.strptime(last_checked, '%Y-%m-%d %H:%M:%S')
-                            last_check_timestamp = last_check_dt.timestamp()
-                            time_since_check = current_time - last_check_timestamp
-                        except:
-                            # If parsing fails, check immediately
-                            time_since_check = check_interval + 1
+                # Pick up edits to the config file (one stat per cycle)
+                config_mtime = self._config_file_mtime()
+                if config_mtime is not None and config_mtime != synced_config_mtime:
+                    changed, fingerprint = self.config_changed_since_sync()
+                    if not changed:
+                        # Touched but identical to the last synced content
+                        self.save_sync_state(fingerprint)
                     else:
-                        # Never checked, check immediately
-                        time_since_check = check_interval + 1
-                    
-                    # Should we check this thread?
-                    if time_since_check >= check_interval:
-                        threads_to_check.append({
-                            'tid': tid,
-                            'title': thread['title'],
-                            'check_interval': check_interval,
-                            'overdue_by': time_since_check - check_interval
-                        })
+                        logger.info("Config file changed, syncing monitored threads...")
+                        sync_result = self.load_from_config(stop_event=stop_event)
+                        if 'error' in sync_result:
+                            logger.warning("Config sync: %s", sync_result['error'])
+                        elif not sync_result['errors'] and not (stop_event and stop_event.is_set()):
+                            # The next restart can skip this sync
+                            self.save_sync_state(fingerprint)
+                    # Not retried until the file changes again, even on error
+                    synced_config_mtime = config_mtime
+                
+                # Threads whose check_interval has passed (filtered by SQLite on
+                # the wall clock), minus any this process checked more recently
+                # than check_interval ago by the monotonic clock. A forward
+                # clock step then can't make every thread due at once
+                now_ns = time.monotonic_ns()
+                threads_to_check = [
+                    thread for thread in self.db.get_due_monitored_threads(time.time())
+                    if thread['tid'] not in self._last_check_mono
+                    or now_ns - self._last_check_mono[thread['tid']] >= thread['check_interval'] * 1_000_000_000
+                ]
                 
                 # Check threads that are due
                 if threads_to_check:
-                    print(f"\n{'='*80}")
-                    print(f"Checking {len(threads_to_check)} thread(s) due for update")
-                    print(f"{'='*80}")
+                    logger.info("%s\nChecking %d thread(s) due for update\n%s",
+                                _BANNER, len(threads_to_check), _BANNER)
+                    
+                    # Checks run concurrently (non-verbose, their output would
+                    # interleave); results are collected and logged in one record
+                    futures = {
+                        self._check_pool.submit(self.check_thread, thread['tid'], verbose=False,
+                                                monitor_config=thread, thread=thread, defer_commit=True): thread
+                        for thread in threads_to_check
+                    }
+                    checks = []
+                    lines = []
+                    for future in as_completed(futures):
+                        thread = futures[future]
+                        result = future.result()
+                        lines.append(f"Thread {thread['tid']}: {thread['title']}")
+                        lines.append(f"  Check interval: {thread['check_interval']}s")
+                        if thread['last_checked_ts'] and thread['overdue_by'] > 0:
+                            lines.append(f"  Overdue by: {thread['overdue_by']:.0f}s")
+                        if 'error' in result:
+                            lines.append(f"  ✗ {result['error']}")
+                        else:
+                            lines.append(f"  ✓ {result['new_posts']} new post(s)")
+                        if 'check' in result:
+                            checks.append(result.pop('check'))
+                            self._last_check_mono[thread['tid']] = time.monotonic_ns()
                     
-                    for thread_info in threads_to_check:
-                        print(f"\nThread {thread_info['tid']}: {thread_info['title']}")
-                        print(f"  Check interval: {thread_info['check_interval']}s")
-                        if thread_info['overdue_by'] > 0:
-                            print(f"  Overdue by: {thread_info['overdue_by']:.0f}s")
-                        
-                        self.check_thread(thread_info['tid'], verbose=True)
-                        
-                        # Small delay between threads
-                        time.sleep(1)
+                    # One commit for the cycle's check records, one for buffered events
+                    if checks:
+                        with self._write_lock:
+                            self._write_checks(checks)
+                            self.db.conn.commit()
+                    self._flush_events()
                     
-                    print(f"\n{'='*80}")
-                    print(f"Completed checking {len(threads_to_check)} thread(s)")
-                    print(f"{'='*80}")
+                    lines += [_BANNER, f"Completed checking {len(threads_to_check)} thread(s)", _BANNER]
+                    logger.info("\n".join(lines))
+                
+                # Keep planner statistics current as posts accumulate
+                if time.monotonic() - last_optimize >= OPTIMIZE_EVERY:
+                    with self._write_lock:
+                        self.db.optimize()
+                    last_optimize = time.monotonic()
                 
-                # Show status of all threads
-                print(f"\nMonitoring {len(monitored)} thread(s):")
-                for thread in monitored:
-                    last_checked = thread['last_checked'] or 'Never'
-                    print(f"  TID {thread['tid']}: {thread['title']}")
-                    print(f"    Interval: {thread['check_interval']}s, Last checked: {last_checked}")
+                # Count and earliest upcoming due time, without re-reading every row.
+                # Threads whose check just failed stay due and are retried after
+                # at most check_all_interval
+                current_time = time.time()
+                monitored_count, next_due_at = self.db.get_monitoring_schedule(current_time)
                 
-                # Wait before next check cycle
-                print(f"\nWaiting {check_all_interval}s until next evaluation...")
+                if not monitored_count:
+                    logger.info("No threads being monitored. Waiting...")
+                    wait = check_all_interval
+                else:
+                    # Wait until the earliest thread is due (at most check_all_interval)
+                    if next_due_at is None:
+                        wait = check_all_interval
+                    else:
+                        wait = min(max(0.0, next_due_at - current_time), check_all_interval)
+                    
+                    lines = [f"Monitoring {monitored_count} thread(s)"]
+                    if cycle % STATUS_LOG_EVERY == 0:
+                        for thread in self.db.iter_monitoring_status():
+                            lines.append(f"  TID {thread['tid']}: {thread['title']}")
+                            lines.append(f"    Interval: {thread['check_interval']}s, "
+                                         f"Last checked: {thread['last_checked'] or 'Never'}")
+                    lines.append(f"Waiting {wait:.0f}s until next evaluation...")
+                    logger.info("\n".join(lines))
+                cycle += 1
                 
                 if stop_event:
-                    # Sleep in small chunks to respond quickly to stop signal
-                    for _ in range(check_all_interval):
-                        if stop_event.is_set():
-                            print("\nMonitoring loop stopped by signal")
-                            return
-                        time.sleep(1)
+                    # Returns as soon as the stop signal is set
+                    if stop_event.wait(wait):
+                        logger.info("Monitoring loop stopped by signal")
+                        return
                 else:
-                    time.sleep(check_all_interval)
+                    time.sleep(wait)
                 
         except KeyboardInterrupt:
-            print("\n\nMonitoring stopped by user")
+            logger.info("Monitoring stopped by user")
+    
+    def _write_checks(self, checks: List[Tuple]):
+        """
+        Record completed checks: last_checked, last_post_timestamp and one event each
+        (caller commits, holding _write_lock).
+        
+        Args:
+            checks: Records built by _check_record
+        """
+        self.db.conn.executemany('''
+            UPDATE monitored_threads SET
+                last_checked = ?,
+                last_checked_ts = ?,
+                last_post_timestamp = MAX(last_post_timestamp, ?)
+            WHERE tid = ?
+        ''', [(checked_at, checked_ts, last_ts, tid) for tid, checked_at, checked_ts, last_ts, *_ in checks])
+        self.db.conn.executemany(_INSERT_EVENT_SQL, [(tid, event_type, post_count, message, checked_at)
+              for tid, checked_at, _, _, event_type, post_count, message in checks])
     
     def _log_event(self, tid: int, event_type: str, post_count: int, message: str):
-        """Log a monitoring event."""
-        self.db.cursor.execute('''
-            INSERT INTO monitoring_events (tid, event_type, post_count, message)
-            VALUES (?, ?, ?, ?)
-        ''', (tid, event_type, post_count, message))
+        """
+        Log a monitoring event.
+        
+        Events are buffered and written in one transaction by _flush_events
+        (end of each check cycle, on close, or once EVENT_BUFFER_MAX are pending).
+        """
+        created_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        with self._write_lock:
+            self._event_buffer.append((tid, event_type, post_count, message, created_at))
+            if len(self._event_buffer) >= EVENT_BUFFER_MAX:
+                self._flush_events()
+    
+    def _flush_events(self):
+        """Write all buffered monitoring events with one executemany and one commit."""
+        with self._write_lock:
+            if not self._event_buffer:
+                return
+            with self.db.transaction():
+                self.db.conn.executemany(_INSERT_EVENT_SQL, self._event_buffer)
+            self._event_buffer.clear()
     
-    def get_events(self, tid: Optional[int] = None, limit: int = 50) -> List[Dict[str, Any]]:
+    def get_events(self, tid: Optional[int] = None, limit: int = 50) -> List[Event]:
         """Get monitoring event history."""
+        # Plain tuples straight from sqlite3, no per-row sqlite3.Row / dict copy
+        cursor = self.db.conn.cursor()
+        cursor.row_factory = None
         if tid:
-            query = '''
-                SELECT * FROM monitoring_events 
-                WHERE tid = ? 
-                ORDER BY created_at DESC 
-                LIMIT ?
-            '''
-            self.db.cursor.execute(query, (tid, limit))
+            cursor.execute(_SELECT_THREAD_EVENTS_SQL, (tid, limit))
         else:
-            query = '''
-                SELECT e.*, t.title 
-                FROM monitoring_events e
-                JOIN threads t ON e.tid = t.tid
-                ORDER BY e.created_at DESC 
-                LIMIT ?
-            '''
-            self.db.cursor.execute(query, (limit,))
+            cursor.execute(_SELECT_EVENTS_SQL, (limit,))
         
-        return [dict(row) for row in self.db.cursor.fetchall()]
+        return [Event._make(row) for row in cursor.fetchall()]
     
     def close(self):
-        """Close database connection."""
+        """Write pending events, then close database connections and notification senders."""
+        self._check_pool.shutdown()
+        self._flush_events()
+        self.read_pool.close()
         self.db.close()
+        self.notification_manager.close()
 
 
 def main():
@@ -863,6 +1104,7 @@ def main():
         parser.print_help()
         return
     
+    configure_cli_logging()
     monitor = ThreadMonitor()
     
     try:
@@ -901,9 +1143,9 @@ def main():
             if events:
                 print(f"\nMonitoring events ({len(events)}):\n")
                 for e in events:
-                    title_info = f" - {e.get('title', '')}" if 'title' in e else ""
-                    print(f"  [{e['created_at']}] TID {e['tid']}{title_info}")
-                    print(f"    {e['event_type']}: {e['message']} ({e['post_count']} posts)")
+                    title_info = f" - {e.title}" if e.title is not None else ""
+                    print(f"  [{e.created_at}] TID {e.tid}{title_info}")
+                    print(f"    {e.event_type}: {e.message} ({e.post_count} posts)")
             else:
                 print("\nNo events found")
         
@@ -6,13 +6,24 @@ Automatically fetches all pages using multi-threading.
 """
 
 import argparse
-import json
+import logging
 import sys
 import time
 import threading
 from typing import Dict, Any, Optional, List
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
+import orjson
 import requests
+from requests.adapters import HTTPAdapter, Retry
+
+
+logger = logging.getLogger("nga.crawler")
+
+# crawl_pages_range_with_callback logs progress for every Nth page only
+PAGE_LOG_EVERY = 10
+
+# How often crawl_pages_range_with_callback checks stop_event while waiting
+STOP_POLL_INTERVAL = 1.0
 
 
 class NGACrawler:
@@ -29,10 +40,14 @@ class NGACrawler:
         self.config = self._load_config(config_path)
         self.session = self._create_session()
         
-        # Rate limiting setup
+        # Rate limiting setup: a token bucket refilled at rate_limit per minute.
+        # Up to max_threads requests may start together, the long-run rate
+        # stays at rate_limit_per_minute
         self.rate_limit = self.config.get('rate_limit_per_minute', 30)
-        self.min_interval = 60.0 / self.rate_limit  # Seconds between requests
-        self.last_request_time = 0
+        self.min_interval = 60.0 / self.rate_limit  # Seconds per token
+        self.burst = max(1, self.config['max_threads'])
+        self.tokens = float(self.burst)
+        self.last_refill = time.monotonic()
         self.rate_limit_lock = threading.Lock()
     
     def _load_config(self, config_path: str) -> Dict[str, Any]:
@@ -49,8 +64,8 @@ class NGACrawler:
             SystemExit: If config file cannot be loaded
         """
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                config = json.load(f)
+            with open(config_path, 'rb') as f:
+                config = orjson.loads(f.read())
             
             # Validate required fields
             required_fields = ['ngaPassportUid', 'ngaPassportCid']
@@ -73,7 +88,7 @@ class NGACrawler:
             print(f"Error: Config file not found: {config_path}", file=sys.stderr)
             print("Please create a config.json file based on config.example.json", file=sys.stderr)
             sys.exit(1)
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             print(f"Error: Invalid JSON in config file: {e}", file=sys.stderr)
             sys.exit(1)
     
@@ -98,21 +113,47 @@ class NGACrawler:
         session.cookies.set('ngaPassportUid', self.config['ngaPassportUid'])
         session.cookies.set('ngaPassportCid', self.config['ngaPassportCid'])
         
+        # Keep one kept-alive connection per worker thread; the default pool
+        # of 10 would drop and reopen connections when max_threads is larger
+        pool_size = max(10, self.config['max_threads'])
+        # Transient failures (throttling, gateway errors, dropped connections)
+        # are retried on the kept-alive connection with backoff, honouring
+        # Retry-After, instead of failing the page. POST is included since
+        # the post list request only reads
+        retries = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504),
+                        allowed_methods=None, raise_on_status=False)
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=pool_size, max_retries=retries)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        
         return session
     
-    def _rate_limit(self):
-        """Apply rate limiting before making a request."""
+    def _rate_limit(self, stop_event=None):
+        """
+        Apply rate limiting before making a request.
+        
+        Takes a token from the bucket. When it is empty the token is reserved
+        ahead (tokens goes negative) and the caller sleeps outside the lock,
+        so waiting workers queue up in order without blocking each other's
+        accounting.
+        
+        Args:
+            stop_event: Optional threading.Event that cuts the wait short
+        """
         with self.rate_limit_lock:
-            current_time = time.time()
-            time_since_last = current_time - self.last_request_time
-            
-            if time_since_last < self.min_interval:
-                sleep_time = self.min_interval - time_since_last
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.last_refill) / self.min_interval)
+            self.last_refill = now
+            self.tokens -= 1
+            sleep_time = -self.tokens * self.min_interval
+        
+        if sleep_time > 0:
+            if stop_event:
+                stop_event.wait(sleep_time)
+            else:
                 time.sleep(sleep_time)
-            
-            self.last_request_time = time.time()
     
-    def fetch_page(self, tid: int, page: int) -> Optional[Dict[str, Any]]:
+    def fetch_page(self, tid: int, page: int, stop_event=None) -> Optional[Dict[str, Any]]:
         """
         Fetch a single page of posts from a thread.
         Rate limited according to config.
@@ -120,12 +161,19 @@ class NGACrawler:
         Args:
             tid: Thread ID
             page: Page number
+            stop_event: Optional threading.Event; once set, the page is not
+                requested (also checked after the rate-limit wait)
             
         Returns:
-            JSON response as dictionary, or None if request failed
+            JSON response as dictionary, or None if request failed or was stopped
         """
+        if stop_event and stop_event.is_set():
+            return None
+        
         # Apply rate limiting
-        self._rate_limit()
+        self._rate_limit(stop_event)
+        if stop_event and stop_event.is_set():
+            return None
         
         params = {
             '__lib': 'post',
@@ -146,11 +194,11 @@ class NGACrawler:
             )
             response.raise_for_status()
             
-            return response.json()
+            return orjson.loads(response.content)
         except requests.exceptions.RequestException as e:
             print(f"Error fetching page {page}: {e}", file=sys.stderr)
             return None
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             print(f"Error decoding JSON response for page {page}: {e}", file=sys.stderr)
             return None
     
@@ -294,7 +342,8 @@ class NGACrawler:
         
         return results
     
-    def crawl_pages_range_with_callback(self, tid: int, start_page: int, end_page: int, callback, stop_event=None):
+    def crawl_pages_range_with_callback(self, tid: int, start_page: int, end_page: int, callback, stop_event=None,
+                                        parse=None):
         """
         Crawl a range of pages and call callback immediately when each page completes.
         This allows processing (e.g., saving to DB) as pages arrive instead of waiting for all.
@@ -305,6 +354,9 @@ class NGACrawler:
             end_page: Ending page number (inclusive)
             callback: Function(page_num, page_result) called when each page completes
             stop_event: Optional threading.Event to signal early stop
+            parse: Optional function applied to each fetched page on the worker
+                thread, so parsing overlaps other fetches and the callback's work;
+                the callback then receives parse(page_result)
         """
         if start_page > end_page:
             return
@@ -315,41 +367,57 @@ class NGACrawler:
         completed = 0
         total = len(pages)
         
-        with ThreadPoolExecutor(max_workers=max_threads) as executor:
+        def fetch(page):
+            result = self.fetch_page(tid, page, stop_event)
+            if parse is not None and result:
+                result = parse(result)
+            return result
+        
+        executor = ThreadPoolExecutor(max_workers=max_threads)
+        stopped = False
+        try:
             # Submit all tasks
             future_to_page = {
-                executor.submit(self.fetch_page, tid, page): page 
+                executor.submit(fetch, page): page 
                 for page in pages
             }
             
-            # Process results as they complete
-            for future in as_completed(future_to_page):
-                # Check if we should stop
+            # Process results as they complete, checking for a stop at least
+            # every STOP_POLL_INTERVAL even while no page completes
+            pending = set(future_to_page)
+            while pending:
+                done, pending = wait(pending, timeout=STOP_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                
+                # Check if we should stop; pages finishing now are discarded
                 if stop_event and stop_event.is_set():
-                    print(f"\n  ⚠ Fetch interrupted by stop signal ({completed}/{total} pages completed)")
-                    # Cancel remaining futures
-                    for f in future_to_page:
-                        f.cancel()
+                    logger.warning("  ⚠ Fetch interrupted by stop signal (%d/%d pages completed)", completed, total)
+                    stopped = True
                     return
                 
-                page_num = future_to_page[future]
-                completed += 1
-                try:
-                    result = future.result()
-                    print(f"  ✓ Fetched page {page_num}/{end_page} ({completed}/{total})")
-                    # Call callback immediately with the result
-                    callback(page_num, result)
-                except Exception as e:
-                    print(f"  ✗ Error fetching page {page_num}/{end_page}: {e}")
-                    # Call callback with None to indicate failure
-                    callback(page_num, None)
+                for future in done:
+                    page_num = future_to_page[future]
+                    completed += 1
+                    try:
+                        result = future.result()
+                        if completed % PAGE_LOG_EVERY == 0 or completed == total:
+                            logger.info("  ✓ Fetched page %d/%d (%d/%d)", page_num, end_page, completed, total)
+                        # Call callback immediately with the result
+                        callback(page_num, result)
+                    except Exception as e:
+                        logger.warning("  ✗ Error fetching page %d/%d: %s", page_num, end_page, e)
+                        # Call callback with None to indicate failure
+                        callback(page_num, None)
+        finally:
+            # Queued pages are dropped. On a stop, requests already on the
+            # wire finish in the background instead of delaying the return
+            executor.shutdown(wait=not stopped, cancel_futures=True)
     
     def _print_result(self, result: Dict[str, Any], page_num: int):
         """Print a single page result."""
         print(f"{'='*80}")
         print(f"Page {page_num}")
         print(f"{'='*80}\n")
-        print(json.dumps(result, indent=2, ensure_ascii=False))
+        print(orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode())
         print()
 
 
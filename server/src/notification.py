@@ -4,13 +4,22 @@ Notification interface and implementations for NGA monitor.
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, List
+import orjson
 import requests
+from requests.adapters import HTTPAdapter, Retry
+
+# Max network notifications in flight at once in NotificationManager
+SEND_MANY_WORKERS = 4
 
 
 class NotificationSender(ABC):
     """Abstract base class for notification senders."""
     
+    # Whether send() may be called from several threads at once
+    concurrent_sends = False
+    
     @abstractmethod
     def send(self, title: str, message: str, **kwargs) -> bool:
         """
@@ -35,11 +44,17 @@ class NotificationSender(ABC):
             True if configured and ready to send
         """
         pass
+    
+    def close(self):
+        """Release any resources held by the sender."""
+        pass
 
 
 class BarkNotificationSender(NotificationSender):
     """Bark notification sender implementation."""
     
+    concurrent_sends = True
+    
     def __init__(self, config: Dict[str, Any]):
         """
         Initialize Bark sender.
@@ -53,10 +68,26 @@ class BarkNotificationSender(NotificationSender):
         self.group = config.get('bark_group', 'NGA')
         self.icon = config.get('bark_icon', '')
         self.timeout = config.get('bark_timeout', 10)
+        self._configured = bool(self.server_url and self.device_key)
+        
+        # Format: http://server/device_key, with the rest passed as query params
+        self._api_url = f"{self.server_url.rstrip('/')}/{self.device_key}"
+        
+        # Query params that stay the same unless overridden per send
+        self._base_params = {'sound': self.sound, 'group': self.group}
+        if self.icon:
+            self._base_params['icon'] = self.icon
+        
+        # Keep-alive session so bursts of notifications reuse connections
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16,
+                              max_retries=Retry(total=2, backoff_factor=0.2))
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
     
     def is_configured(self) -> bool:
         """Check if Bark is configured."""
-        return bool(self.server_url and self.device_key)
+        return self._configured
     
     def send(self, title: str, message: str, **kwargs) -> bool:
         """
@@ -74,37 +105,33 @@ class BarkNotificationSender(NotificationSender):
         Returns:
             True if sent successfully
         """
-        if not self.is_configured():
+        if not self._configured:
             print("Bark not configured, skipping notification")
             return False
         
         try:
-            # Build Bark API URL
-            # Format: http://server/device_key/title/message
-            api_url = f"{self.server_url.rstrip('/')}/{self.device_key}"
-            
-            # Prepare parameters
-            params = {
-                'title': title,
-                'body': message,
-                'sound': kwargs.get('sound', self.sound),
-                'group': kwargs.get('group', self.group)
-            }
+            params = {**self._base_params, 'title': title, 'body': message}
             
-            # Optional parameters
-            if kwargs.get('url'):
-                params['url'] = kwargs['url']
-            
-            icon = kwargs.get('icon', self.icon)
-            if icon:
-                params['icon'] = icon
+            # Optional parameters / per-call overrides
+            if kwargs:
+                if kwargs.get('url'):
+                    params['url'] = kwargs['url']
+                if 'sound' in kwargs:
+                    params['sound'] = kwargs['sound']
+                if 'group' in kwargs:
+                    params['group'] = kwargs['group']
+                if 'icon' in kwargs:
+                    if kwargs['icon']:
+                        params['icon'] = kwargs['icon']
+                    else:
+                        params.pop('icon', None)
             
             # Send request
-            response = requests.get(api_url, params=params, timeout=self.timeout)
+            response = self.session.get(self._api_url, params=params, timeout=self.timeout)
             response.raise_for_status()
             
             # Check response
-            result = response.json()
+            result = orjson.loads(response.content)
             if result.get('code') == 200:
                 return True
             else:
@@ -117,6 +144,10 @@ class BarkNotificationSender(NotificationSender):
         except Exception as e:
             print(f"Error sending Bark notification: {e}")
             return False
+    
+    def close(self):
+        """Close the HTTP session."""
+        self.session.close()
 
 
 class ConsoleNotificationSender(NotificationSender):
@@ -157,7 +188,12 @@ class ConsoleNotificationSender(NotificationSender):
 
 
 class NotificationManager:
-    """Manages multiple notification senders."""
+    """
+    Manages multiple notification senders.
+    
+    Callers that build notifications from thread data should check
+    has_senders() first, so no formatting is done when nothing is enabled.
+    """
     
     def __init__(self, config: Dict[str, Any]):
         """
@@ -178,11 +214,23 @@ class NotificationManager:
         console_sender = ConsoleNotificationSender(config)
         if console_sender.is_configured():
             self.senders.append(console_sender)
+        
+        # Senders that allow concurrent sends (Bark) run here, so a slow
+        # endpoint delays a notification by its own latency, not the sum
+        self._executor = ThreadPoolExecutor(max_workers=SEND_MANY_WORKERS, thread_name_prefix='nga-notify')
+        
+        self._has_senders = len(self.senders) > 0
+        
+        # Bound send methods, split by dispatch, resolved once instead of per send
+        self._pooled_send_fns: List[Callable[..., bool]] = [s.send for s in self.senders if s.concurrent_sends]
+        self._inline_send_fns: List[Callable[..., bool]] = [s.send for s in self.senders if not s.concurrent_sends]
     
     def send(self, title: str, message: str, **kwargs) -> int:
         """
         Send notification via all configured senders.
         
+        Network senders send concurrently; the others send on the caller's thread.
+        
         Args:
             title: Notification title
             message: Notification message
@@ -191,15 +239,40 @@ class NotificationManager:
         Returns:
             Number of successful sends
         """
-        success_count = 0
-        for sender in self.senders:
-            if sender.send(title, message, **kwargs):
-                success_count += 1
-        return success_count
+        futures = [self._executor.submit(send, title, message, **kwargs) for send in self._pooled_send_fns]
+        success_count = sum(1 for send in self._inline_send_fns if send(title, message, **kwargs))
+        return success_count + sum(1 for future in futures if future.result())
+    
+    def send_many(self, notifications: List[Dict[str, Any]]) -> int:
+        """
+        Send several notifications via all configured senders.
+        
+        Senders that allow it (Bark) send up to SEND_MANY_WORKERS
+        notifications concurrently; the others send them in order on the
+        caller's thread meanwhile.
+        
+        Args:
+            notifications: List of send() keyword dicts (title, message, ...)
+            
+        Returns:
+            Number of successful sends
+        """
+        futures = [self._executor.submit(lambda send=send, n=n: send(**n))
+                   for send in self._pooled_send_fns
+                   for n in notifications]
+        success_count = sum(1 for send in self._inline_send_fns
+                            for n in notifications if send(**n))
+        return success_count + sum(1 for future in futures if future.result())
     
     def has_senders(self) -> bool:
         """Check if any senders are configured."""
-        return len(self.senders) > 0
+        return self._has_senders
+    
+    def close(self):
+        """Wait for pending sends, then close all senders."""
+        self._executor.shutdown()
+        for sender in self.senders:
+            sender.close()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,7 @@
+"""
+Shared pytest setup: make the server package (src.*) importable.
+"""
+import sys
+import pathlib
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parents[1]))
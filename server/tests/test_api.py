@@ -2,16 +2,18 @@
 """
 Test script to verify the API functionality.
 """
-import sys
-import os
-sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from pathlib import Path
 
-from src.database import NGADatabase
+import orjson
+import pytest
+from fastapi.testclient import TestClient
 
-def test_get_posts_after():
-    """Test the get_posts_after method."""
-    db = NGADatabase('data/nga_data.db')
-    
+from src.api import app
+from src.database import NGADatabase, NGADatabasePool, PoolTimeoutError
+
+
+def _seed(db):
+    """Save the test thread 12345 and its three posts."""
     # Create test data
     thread = {
         'tid': 12345,
@@ -58,34 +60,146 @@ def test_get_posts_after():
         },
     ]
     
-    for post in posts:
-        db.save_post(post)
+    # One executemany in one transaction for the whole setup
+    assert db.save_posts_batch(posts) == 3, "Expected 3 posts saved"
+
+
+@pytest.fixture(scope="module")
+def db():
+    """In-memory database with one thread and three posts, shared by the tests below."""
+    # Fresh in-memory database: no disk I/O, and no rows left over from
+    # earlier runs (or a real data/nga_data.db) to skew the counts
+    db = NGADatabase(':memory:')
+    _seed(db)
+    
+    yield db
+    db.close()
+
+
+@pytest.fixture(scope="module")
+def client(tmp_path_factory):
+    """API client reading the seeded data through a read-only pool, without starting the monitor."""
+    # Pooled connections each open the file, so this needs an on-disk database
+    db_path = str(tmp_path_factory.mktemp("api") / "nga_data.db")
+    db = NGADatabase(db_path)
+    _seed(db)
+    with open(Path(__file__).parent.parent / 'data' / 'schema_monitor.sql') as f:
+        db.conn.executescript(f.read())
+    db.conn.execute('INSERT INTO monitored_threads (tid) VALUES (12345)')
+    db.conn.commit()
+    db.close()
     
-    # Test 1: Get all posts after post_number 0
+    # Not entering the client context skips the lifespans (and the monitor)
+    app.state.db_pool = NGADatabasePool(db_path, size=1, read_only=True, timeout=1.0)
+    app.state.monitor = None
+    yield TestClient(app)
+    app.state.db_pool.close()
+
+
+def test_get_posts_after_all(db):
+    """All posts after post_number 0."""
     result = db.get_posts_after(12345, 0)
     assert len(result) == 3, f"Expected 3 posts, got {len(result)}"
-    print("✓ Test 1 passed: Get all posts after 0")
-    
-    # Test 2: Get posts after post_number 1
+
+
+def test_get_posts_after_one(db):
+    """Posts after post_number 1, in post_number order."""
     result = db.get_posts_after(12345, 1)
     assert len(result) == 2, f"Expected 2 posts, got {len(result)}"
     assert result[0]['post_number'] == 2, "Expected first post to be post_number 2"
-    print("✓ Test 2 passed: Get posts after 1")
-    
-    # Test 3: Get posts after post_number 1 filtered by author_uid 100
+
+
+def test_get_posts_after_author_filter(db):
+    """Posts after post_number 1 filtered by author_uid 100."""
     result = db.get_posts_after(12345, 1, author_uid=100)
     assert len(result) == 1, f"Expected 1 post, got {len(result)}"
     assert result[0]['post_number'] == 3, "Expected post_number 3"
     assert result[0]['author_uid'] == 100, "Expected author_uid 100"
-    print("✓ Test 3 passed: Get posts after 1 filtered by author_uid 100")
-    
-    # Test 4: Get posts after post_number 3 (should be empty)
+
+
+def test_get_posts_after_empty(db):
+    """Posts after the last post_number (should be empty)."""
     result = db.get_posts_after(12345, 3)
     assert len(result) == 0, f"Expected 0 posts, got {len(result)}"
-    print("✓ Test 4 passed: Get posts after 3 (empty result)")
+    assert not db.has_posts_after(12345, 3), "Expected no posts after 3"
+    assert db.has_posts_after(12345, 2), "Expected a post after 2"
+
+
+def test_get_posts_after_limit(db):
+    """Limit caps the number of posts returned."""
+    result = db.get_posts_after(12345, 0, limit=2)
+    assert [p['post_number'] for p in result] == [1, 2], f"Expected posts 1-2, got {result}"
+
+
+def test_posts_ndjson_stream(client):
+    """format=ndjson streams one post per line, capped by limit."""
+    response = client.get("/api/v1/posts", params={"tid": 12345, "start_post_number": 0,
+                                                   "limit": 2, "format": "ndjson"})
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.content.splitlines()
+    assert len(lines) == 2, f"Expected 2 lines, got {lines}"
+    assert [orjson.loads(line)['post_number'] for line in lines] == [1, 2]
     
+    # The stream used the request's only pooled connection and handed it back
+    response = client.get("/api/v1/posts", params={"tid": 12345, "start_post_number": 0})
+    assert [p['post_number'] for p in response.json()] == [1, 2, 3]
+    assert response.headers["cache-control"] == "max-age=5"
+
+
+def test_pool_timeout(client):
+    """An exhausted pool raises PoolTimeoutError, which the API answers with 503."""
+    pool = NGADatabasePool(':memory:', size=1, timeout=0.01)
+    with pool.connection():
+        with pytest.raises(PoolTimeoutError):
+            with pool.connection():
+                pass
+    pool.close()
+    
+    with app.state.db_pool.connection():
+        response = client.get("/api/v1/posts", params={"tid": 12345, "start_post_number": 0})
+    assert response.status_code == 503, response.text
+
+
+def test_search_posts_fts():
+    """CJK keywords of 3+ characters go through posts_fts, shorter ones through LIKE."""
+    db = NGADatabase(':memory:')
+    _seed(db)
+    db.save_post({'pid': 4, 'tid': 12345, 'fid': 1, 'author_name': 'User3', 'author_uid': 300,
+                  'post_date': '2024-01-01 12:03', 'post_timestamp': 1704096180,
+                  'content': '今天的版本更新公告', 'post_number': 4})
+    
+    assert [p['pid'] for p in db.search_posts('版本更新')] == [4], "Expected the FTS match"
+    assert [p['pid'] for p in db.search_posts('公告')] == [4], "Expected the LIKE fallback match"
+    assert db.search_posts('不存在的词') == []
+    
+    # Replacing the post's content re-indexes it
+    db.save_post({'pid': 4, 'tid': 12345, 'fid': 1, 'author_name': 'User3', 'author_uid': 300,
+                  'post_date': '2024-01-01 12:03', 'post_timestamp': 1704096180,
+                  'content': '维护延期通知', 'post_number': 4})
+    assert db.search_posts('版本更新') == [], "Old content should no longer match"
+    assert [p['pid'] for p in db.search_posts('维护延期')] == [4], "New content should match"
     db.close()
-    print("\n✓ All tests passed!")
 
-if __name__ == '__main__':
-    test_get_posts_after()
+
+def test_threads_not_modified(client, monkeypatch):
+    """A repeated request with the ETag gets 304 from the cache, without a pooled connection."""
+    monkeypatch.setattr(app.state, "monitor", object())
+    response = client.get("/api/v1/threads")
+    assert response.status_code == 200, response.text
+    assert [t['tid'] for t in response.json()] == [12345]
+    etag = response.headers["etag"]
+    
+    # Holding the pool's only connection: a cache hit must not need one
+    with app.state.db_pool.connection():
+        response = client.get("/api/v1/threads", headers={"If-None-Match": etag})
+        assert response.status_code == 304, response.text
+        assert response.content == b""
+        
+        # Weak, listed and wildcard forms match too
+        for header in (f'W/{etag}', f'"stale", {etag}', '*'):
+            response = client.get("/api/v1/threads", headers={"If-None-Match": header})
+            assert response.status_code == 304, header
+    
+    response = client.get("/api/v1/threads", headers={"If-None-Match": '"stale", W/"other"'})
+    assert response.status_code == 200
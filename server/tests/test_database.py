@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Tests for NGADatabase.transaction().
+"""
+import sqlite3
+
+import pytest
+
+from src.database import NGADatabase
+
+
+def _thread(tid):
+    return {'tid': tid, 'title': f'Thread {tid}', 'author_name': 'TestUser', 'author_uid': 100}
+
+
+def _post(pid, tid=1):
+    return {
+        'pid': pid,
+        'tid': tid,
+        'fid': 1,
+        'author_name': 'User1',
+        'author_uid': 100,
+        'post_date': '2024-01-01 12:00',
+        'post_timestamp': 1704096000 + pid,
+        'content': f'Post {pid}',
+        'post_number': pid
+    }
+
+
+@pytest.fixture
+def db(tmp_path):
+    """File-backed database, so a second connection can see what was committed."""
+    db = NGADatabase(str(tmp_path / 'nga_data.db'))
+    db.save_thread(_thread(1))
+    yield db
+    db.close()
+
+
+def _committed_pids(db):
+    """pids visible to a separate connection, i.e. committed ones."""
+    conn = sqlite3.connect(db.db_path)
+    try:
+        return sorted(row[0] for row in conn.execute('SELECT pid FROM posts'))
+    finally:
+        conn.close()
+
+
+def test_transaction_commits_on_exit(db):
+    """Writes in the block are committed together when it exits."""
+    with db.transaction():
+        db.save_posts_batch([_post(1), _post(2)])
+        # save_posts_batch inside the block does not commit on its own
+        assert _committed_pids(db) == []
+    assert _committed_pids(db) == [1, 2]
+
+
+def test_transaction_rolls_back_on_exception(db):
+    """An exception escaping the block undoes all of its writes."""
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db.save_posts_batch([_post(1)])
+            raise RuntimeError("fail")
+    assert _committed_pids(db) == []
+    assert db.get_posts_after(1, -1) == []
+    assert not db.conn.in_transaction
+
+
+def test_failed_nested_transaction_undoes_only_its_writes(db):
+    """A nested block that fails is rolled back; the outer block still commits."""
+    with db.transaction():
+        db.save_posts_batch([_post(1)])
+        with pytest.raises(RuntimeError):
+            with db.transaction():
+                db.save_thread(_thread(2))
+                db.save_posts_batch([_post(2, tid=2)])
+                raise RuntimeError("fail")
+        db.save_posts_batch([_post(3)])
+    assert _committed_pids(db) == [1, 3]
+    assert db.get_thread(2) is None
+
+
+def test_transaction_commits_pending_writes_first(db):
+    """Writes left open on the connection are committed when the block starts."""
+    db.conn.execute("UPDATE threads SET title = 'Pending' WHERE tid = 1")
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            raise RuntimeError("fail")
+    assert db.get_thread(1)['title'] == 'Pending'